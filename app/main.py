@@ -1,9 +1,15 @@
+import asyncio
 import os
 from fastapi.responses import HTMLResponse
 import uvicorn
 from fastapi import FastAPI, Request
-from core.database import create_db_and_tables
-from routers import login, usertypes, users, clients, roomtypes, roomstatus, room, reservations, reservation_statues,dashboard
+from core.idempotency import idempotent_call
+from core.database import async_engine, create_db_and_tables, pin_to_primary, replica_engines
+from core.config import settings
+from core.logging_config import RequestQueryStats, current_route, request_query_stats, setup_logging, shutdown_logging, sql_logger
+from core.security import password_executor
+from core.token_reaper import token_reaper_loop
+from routers import login, usertypes, users, clients, roomtypes, roomstatus, room, reservations, reservation_statues,dashboard, metrics
 from fastapi.middleware.cors import CORSMiddleware  # habilitar CORS
 
 from fastapi.staticfiles import StaticFiles
@@ -11,6 +17,8 @@ from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 import os
 
+setup_logging()
+
 app = FastAPI()
 
 
@@ -20,7 +28,77 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.on_event("startup")
 def startup():
-    create_db_and_tables()
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        create_db_and_tables()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    if settings.TOKEN_REAPER_ENABLED:
+        app.state.token_reaper = asyncio.create_task(token_reaper_loop())
+
+@app.on_event("shutdown")
+async def shutdown():
+    password_executor.shutdown(wait=False)
+    if getattr(app.state, "token_reaper", None):
+        app.state.token_reaper.cancel()
+    await async_engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    shutdown_logging()
+
+# deja la ruta disponible para el log de consultas lentas
+@app.middleware("http")
+async def bind_request_route(request: Request, call_next):
+    token = current_route.set(f"{request.method} {request.url.path}")
+    try:
+        return await call_next(request)
+    finally:
+        current_route.reset(token)
+
+# rutas cuyo cuerpo se consulta mientras se envía, después de que el middleware ya retornó:
+# un X-DB-Queries en ellas siempre diría 0, así que no lo llevan
+STREAMED_ROUTES = {("GET", "/api/reservations/export")}
+
+# cuenta sentencias y tiempo de BD por petición para detectar N+1
+@app.middleware("http")
+async def track_db_queries(request: Request, call_next):
+    if (request.method, request.url.path) in STREAMED_ROUTES:
+        return await call_next(request)
+    stats = RequestQueryStats()
+    token = request_query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        request_query_stats.reset(token)
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["X-DB-Time-ms"] = f"{stats.time_ms:.1f}"
+    if stats.count > settings.SQL_QUERY_BUDGET:
+        sql_logger.warning(
+            "Query budget exceeded route=%s %s queries (budget %s) %.1f ms repeated=%s",
+            f"{request.method} {request.url.path}", stats.count, settings.SQL_QUERY_BUDGET,
+            stats.time_ms, stats.repeated(),
+        )
+    return response
+
+# reintentos con la misma Idempotency-Key reciben la respuesta original sin volver a crear filas
+IDEMPOTENT_ROUTES = {("POST", "/api/reservations/"), ("POST", "/api/reservations/bulk"), ("POST", "/api/client")}
+
+@app.middleware("http")
+async def idempotency_key(request: Request, call_next):
+    if (request.method, request.url.path) in IDEMPOTENT_ROUTES:
+        return await idempotent_call(request, call_next)
+    return await call_next(request)
+
+# después de una escritura exitosa el cliente lee del primario por unos segundos
+async def pin_writes_to_primary(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        pin_to_primary(request)
+    return response
+
+# sin réplicas todo se lee del primario: no hace falta el middleware
+if replica_engines:
+    app.middleware("http")(pin_writes_to_primary)
 
 @app.get("/", tags=["TEST_RENDER"])
 def read_root():
@@ -39,6 +117,7 @@ app.include_router(clients.router)
 app.include_router(reservation_statues.router)
 app.include_router(reservations.router)
 app.include_router(dashboard.router)
+app.include_router(metrics.router)
 
 
 
@@ -61,6 +140,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # paginación de /api/reservations/
 )
 
 
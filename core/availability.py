@@ -0,0 +1,145 @@
+import asyncio
+import weakref
+from datetime import date
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, exists
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.config import settings
+from core.pricing import ensure_valid_stay
+from models.reservation import Reservation
+from models.reservation_status import ReservationStatus
+from models.room import Room
+from models.room_night import RoomNight
+
+# motores donde FOR UPDATE no existe (SQLAlchemy lo omite): se serializa por habitación dentro del proceso
+DIALECTS_WITHOUT_ROW_LOCKS = {"sqlite"}
+ROOM_LOCK_STRIPES = 64
+# un juego de locks por event loop: asyncio.Lock queda ligado al loop en que se usa
+_room_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[asyncio.Lock]]" = weakref.WeakKeyDictionary()
+
+
+def cancelled_status_ids():
+    return select(ReservationStatus.id).where(ReservationStatus.name.in_(settings.RESERVATION_CANCELLED_STATUSES))
+
+
+def overlapping_reservations(check_in: date, check_out: date, room_id=Room.id):
+    """Reservas no canceladas de la habitación que se cruzan con [check_in, check_out).
+
+    Por defecto se correlaciona con Room.id para usarse dentro de un NOT EXISTS."""
+    # room_id y check_out_date usan el índice ix_reservation_room_id_check_out
+    return (
+        select(Reservation.id)
+        .where(
+            Reservation.room_id == room_id,
+            Reservation.check_in_date < check_out,
+            Reservation.check_out_date > check_in,
+            Reservation.reservation_status_id.not_in(cancelled_status_ids()),
+        )
+    )
+
+
+def occupied_nights(check_in: date, check_out: date, room_id=Room.id):
+    """Noches ocupadas de la habitación en [check_in, check_out): búsqueda por rango en la clave (room_id, night).
+
+    Por defecto se correlaciona con Room.id para usarse dentro de un NOT EXISTS."""
+    return select(RoomNight.reservation_id).where(
+        RoomNight.room_id == room_id,
+        RoomNight.night >= check_in,
+        RoomNight.night < check_out,
+    )
+
+
+def available_rooms_query(check_in: date, check_out: date, capacity: int | None = None, room_type_id: int | None = None):
+    """Habitaciones activas sin noches ocupadas en el rango (anti-join NOT EXISTS sobre room_night)."""
+    query = select(Room).where(Room.active == True, ~exists(occupied_nights(check_in, check_out)))
+    if capacity is not None:
+        query = query.where(Room.capacity >= capacity)
+    if room_type_id is not None:
+        query = query.where(Room.room_type_id == room_type_id)
+    return query.order_by(Room.id)
+
+
+def _release_room_locks(session, transaction):
+    if transaction.parent is None:
+        for lock in session.info.pop("room_locks", {}).values():
+            lock.release()
+
+
+async def _acquire_room_locks(session: AsyncSession, room_ids):
+    loop = asyncio.get_running_loop()
+    stripes = _room_locks.get(loop)
+    if stripes is None:
+        stripes = _room_locks[loop] = [asyncio.Lock() for _ in range(ROOM_LOCK_STRIPES)]
+    # la transacción debe existir antes de tomar los locks para que su fin siempre los libere
+    await session.connection()
+    sync_session = session.sync_session
+    if not sync_session.info.get("room_locks_listener"):
+        # se liberan al terminar la transacción (commit, rollback o cierre de la sesión)
+        event.listen(sync_session, "after_transaction_end", _release_room_locks)
+        sync_session.info["room_locks_listener"] = True
+    held = sync_session.info.setdefault("room_locks", {})
+    # orden fijo de stripes para evitar interbloqueos entre peticiones
+    for index in sorted({room_id % ROOM_LOCK_STRIPES for room_id in room_ids} - held.keys()):
+        await stripes[index].acquire()
+        held[index] = stripes[index]
+
+
+async def lock_rooms(session: AsyncSession, room_ids) -> dict[int, Room]:
+    """Bloquea las filas de las habitaciones (SELECT ... FOR UPDATE) hasta el commit.
+
+    Solo se serializan las reservas de esas habitaciones; el orden por id evita interbloqueos.
+    En motores sin bloqueo de filas (SQLite) usa locks por habitación dentro del proceso."""
+    if session.bind.dialect.name in DIALECTS_WITHOUT_ROW_LOCKS:
+        await _acquire_room_locks(session, room_ids)
+    query = select(Room).where(Room.id.in_(sorted(set(room_ids)))).order_by(Room.id).with_for_update()
+    return {room.id: room for room in (await session.exec(query)).all()}
+
+
+async def is_cancelled_status(session: AsyncSession, reservation_status_id: int) -> bool:
+    return (await session.exec(
+        cancelled_status_ids().where(ReservationStatus.id == reservation_status_id)
+    )).first() is not None
+
+
+async def ensure_room_available(
+    session: AsyncSession,
+    room: Room,
+    check_in: date,
+    check_out: date,
+    reservation_status_id: int,
+    exclude_reservation_id: int | None = None,
+) -> bool:
+    """Lanza 409 si la habitación (ya bloqueada con lock_rooms) tiene otra reserva activa en el rango.
+
+    Retorna False si el estado es de cancelación (la reserva no ocupa la habitación)."""
+    ensure_valid_stay(check_in, check_out)
+    if await is_cancelled_status(session, reservation_status_id):
+        return False
+
+    query = occupied_nights(check_in, check_out, room.id)
+    if exclude_reservation_id is not None:
+        query = query.where(RoomNight.reservation_id != exclude_reservation_id)
+    # lectura con bloqueo: ve lo último confirmado aunque la transacción ya tenga una foto anterior
+    overlap = (await session.exec(query.limit(1).with_for_update(read=True))).first()
+    if overlap is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Room {room.id} is already booked between {check_in} and {check_out}",
+        )
+    return True
+
+
+async def active_reservations_in_range(session: AsyncSession, room_ids, check_in: date, check_out: date) -> list[Reservation]:
+    """Reservas activas de varias habitaciones que se cruzan con [check_in, check_out), en una sola consulta.
+
+    Debe llamarse después de lock_rooms; es una lectura con bloqueo igual que ensure_room_available."""
+    nights = select(RoomNight.reservation_id).where(
+        RoomNight.room_id.in_(list(set(room_ids))),
+        RoomNight.night >= check_in,
+        RoomNight.night < check_out,
+    )
+    query = select(Reservation).where(Reservation.id.in_(nights))
+    return list((await session.exec(query.with_for_update(read=True))).all())
\ No newline at end of file
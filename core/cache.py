@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+
+class TTLCache:
+    """Caché LRU acotada en memoria con expiración por entrada (segura entre hilos)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        # ttl permite acortar la vida de una entrada concreta (p. ej. hasta que expire el JWT)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def discard_where(self, predicate) -> int:
+        """Elimina las entradas cuyo valor cumple el predicado y retorna cuántas se borraron."""
+        with self._lock:
+            keys = [key for key, (value, _) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+
+class InFlight:
+    """Trabajo en curso por clave dentro del event loop: un solo llamador calcula y los duplicados esperan."""
+
+    def __init__(self):
+        self._pending: dict = {}
+
+    async def wait(self, key) -> bool:
+        """Espera a que termine el trabajo en curso de la clave; retorna False si no había ninguno."""
+        pending = self._pending.get(key)
+        if pending is None:
+            return False
+        # shield: si este cliente se desconecta no se cancela la espera de los demás
+        await asyncio.shield(pending)
+        return True
+
+    @asynccontextmanager
+    async def claim(self, key):
+        # llamar sin await de por medio tras un wait() que retornó False; al salir, aunque
+        # falle, se despierta a los que esperan para que vuelvan a consultar su caché
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            yield
+        finally:
+            self._pending.pop(key, None)
+            future.set_result(None)
+
+    def __len__(self):
+        return len(self._pending)
@@ -0,0 +1,35 @@
+import argparse
+
+
+def create_tables():
+    """Crea las tablas que falten según los modelos (equivale al create_all del arranque)."""
+    # importación diferida: --help no necesita conexión a la base de datos
+    from core.database import create_db_and_tables
+
+    create_db_and_tables()
+    print("Tables created")
+
+
+def rebuild_room_nights():
+    """Regenera la tabla room_night desde las reservas (después de la migración o si se desincroniza)."""
+    from core.room_nights import rebuild_room_nights as rebuild
+
+    inserted, skipped = rebuild()
+    print(f"room_night rebuilt: {inserted} nights, {skipped} overlapping nights skipped")
+
+
+COMMANDS = {
+    "create-tables": create_tables,
+    "rebuild-room-nights": rebuild_room_nights,
+}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Tareas de administración de la API")
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args(argv)
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
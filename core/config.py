@@ -6,5 +6,71 @@ load_dotenv()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Opcional: por defecto se deriva de DATABASE_URL (mysql+aiomysql / sqlite+aiosqlite)
+    ASYNC_DATABASE_URL: str | None = os.getenv("ASYNC_DATABASE_URL")
+    # Réplicas de lectura separadas por comas (mismo formato que DATABASE_URL)
+    DATABASE_REPLICA_URLS: list[str] = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    # Segundos que un cliente lee del primario después de escribir
+    REPLICA_PIN_SECONDS: int = int(os.getenv("REPLICA_PIN_SECONDS", 5))
 
-settings = Settings()
+    # Si es false, el esquema se crea aparte con "python -m core.cli create-tables" y el arranque es más rápido
+    DB_CREATE_TABLES_ON_STARTUP: bool = os.getenv("DB_CREATE_TABLES_ON_STARTUP", "true").lower() == "true"
+
+    # Estados de reserva que no ocupan la habitación (nombres de reservationstatus, separados por comas)
+    RESERVATION_CANCELLED_STATUSES: list[str] = [name.strip() for name in os.getenv("RESERVATION_CANCELLED_STATUSES", "Cancelada").split(",") if name.strip()]
+
+    # Filas por lote al exportar reservas en streaming (cursor del servidor)
+    RESERVATION_EXPORT_BATCH_SIZE: int = int(os.getenv("RESERVATION_EXPORT_BATCH_SIZE", 1000))
+
+    # Segundos que se reutiliza la tabla de precios por habitación en las cotizaciones
+    ROOM_PRICE_CACHE_TTL_SECONDS: int = int(os.getenv("ROOM_PRICE_CACHE_TTL_SECONDS", 60))
+
+    # Idempotency-Key en POST de reservas y clientes: "memory" (por proceso) o "db" (compartido entre workers)
+    IDEMPOTENCY_BACKEND: str = os.getenv("IDEMPOTENCY_BACKEND", "memory")
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+    IDEMPOTENCY_MAX_KEYS: int = int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10000))
+    # Con backend db, cuánto espera un duplicado a que termine la petición original en otro worker
+    IDEMPOTENCY_WAIT_SECONDS: int = int(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
+
+    # Segundos que el dashboard reutiliza el total de habitaciones (create_room lo invalida en su proceso)
+    ROOM_COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("ROOM_COUNT_CACHE_TTL_SECONDS", 300))
+
+    # Caché de métricas del dashboard por (mes, año): el mes en curso y los futuros se invalidan al escribir reservas
+    # en este proceso y el TTL acota lo que tarda en verse una escritura de otro worker; los meses cerrados viven más
+    DASHBOARD_CACHE_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", 60))
+    DASHBOARD_CLOSED_MONTH_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CLOSED_MONTH_TTL_SECONDS", 86400))
+
+    # Pool de conexiones de SQLAlchemy
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # segundos; menor que wait_timeout de MySQL
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30))
+
+    # Logs: echo de SQLAlchemy (solo para depurar), umbral de consultas lentas y muestreo del resto
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", 200))
+    SQL_LOG_SAMPLE_RATE: float = float(os.getenv("SQL_LOG_SAMPLE_RATE", 0.0))
+    SQL_QUERY_BUDGET: int = int(os.getenv("SQL_QUERY_BUDGET", 20))
+
+    # Caché de tokens verificados (segundos de vida y número máximo de entradas)
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 30))
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000))
+
+    # Validación de tokens: "db" consulta la tabla token, "epoch" compara el token_version del JWT
+    AUTH_MODE: str = os.getenv("AUTH_MODE", "db")
+    # En modo epoch, tiempo máximo que otro nodo tarda en ver una revocación
+    AUTH_EPOCH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_EPOCH_CACHE_TTL_SECONDS", 10))
+
+    # Pool dedicado para bcrypt (hilos de trabajo y máximo de operaciones pendientes)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+    # Limpieza periódica de la tabla token (tokens vencidos o invalidados)
+    TOKEN_REAPER_ENABLED: bool = os.getenv("TOKEN_REAPER_ENABLED", "true").lower() == "true"
+    TOKEN_REAPER_INTERVAL_SECONDS: int = int(os.getenv("TOKEN_REAPER_INTERVAL_SECONDS", 3600))
+    TOKEN_REAPER_BATCH_SIZE: int = int(os.getenv("TOKEN_REAPER_BATCH_SIZE", 1000))
+    TOKEN_REAPER_MAX_BATCHES: int = int(os.getenv("TOKEN_REAPER_MAX_BATCHES", 50))
+
+settings = Settings()
\ No newline at end of file
@@ -0,0 +1,103 @@
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.cache import InFlight, TTLCache
+from core.config import settings
+from models.reservation import Reservation
+from models.room import Room
+
+# total de habitaciones: cambia muy poco, create_room lo invalida en este proceso
+room_count_cache = TTLCache(maxsize=1, ttl=settings.ROOM_COUNT_CACHE_TTL_SECONDS)
+
+# métricas por (mes, año) y cálculos en curso: peticiones simultáneas del mismo mes esperan al primero
+dashboard_cache = TTLCache(maxsize=240, ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+dashboard_in_flight = InFlight()
+# versión por mes (y global): un cálculo que empezó antes de una invalidación no se guarda
+_month_versions: Counter = Counter()
+_all_months_version = 0
+
+
+def month_bounds(month: int, year: int) -> tuple[date, date]:
+    # rango semiabierto [inicio, inicio del mes siguiente): permite usar el índice de check_in_date
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def month_is_closed(month: int, year: int) -> bool:
+    today = date.today()
+    return (year, month) < (today.year, today.month)
+
+
+def invalidate_dashboard(*check_in_dates: date):
+    """Descarta las métricas de los meses de esas fechas de entrada; sin fechas, las de todos los meses."""
+    global _all_months_version
+    if not check_in_dates:
+        _all_months_version += 1
+        dashboard_cache.clear()
+        return
+    for key in {(day.month, day.year) for day in check_in_dates}:
+        _month_versions[key] += 1
+        dashboard_cache.pop(key)
+
+
+def invalidate_room_count():
+    room_count_cache.clear()
+    # el porcentaje de ocupación de todos los meses depende del total de habitaciones
+    invalidate_dashboard()
+
+
+async def get_room_count(session: AsyncSession) -> int:
+    total = room_count_cache.get("rooms")
+    if total is None:
+        total = (await session.exec(select(func.count(Room.id)))).one()
+        room_count_cache.set("rooms", total)
+    return total
+
+
+async def dashboard_metrics(session: AsyncSession, month: int, year: int) -> dict:
+    """Métricas del mes con una sola consulta agregada sobre las reservas que entran en el mes."""
+    start, end = month_bounds(month, year)
+
+    total_recaudo, habitaciones_reservadas, promedio_dias, total_clientes = (await session.exec(
+        select(
+            func.sum(Reservation.total),
+            func.count(Reservation.id),
+            func.avg(func.datediff(Reservation.check_out_date, Reservation.check_in_date)),
+            func.count(func.distinct(Reservation.client_id)),
+        ).where(Reservation.check_in_date >= start, Reservation.check_in_date < end)
+    )).one()
+
+    total_habitaciones = await get_room_count(session) or 1  # evitar división por cero
+    porcentaje_ocupacion = (habitaciones_reservadas / total_habitaciones) * 100
+
+    return {
+        "total_recaudo": float(total_recaudo or Decimal(0.00)),
+        "porcentaje_ocupacion": round(porcentaje_ocupacion, 2),
+        "promedio_dias": round(promedio_dias or 0, 2),
+        "total_clientes": total_clientes
+    }
+
+
+async def cached_dashboard_metrics(session: AsyncSession, month: int, year: int) -> dict:
+    key = (month, year)
+    while True:
+        metrics = dashboard_cache.get(key)
+        if metrics is not None:
+            return metrics
+        if not await dashboard_in_flight.wait(key):
+            break
+
+    # si el cálculo falla, la siguiente petición en espera lo intenta de nuevo
+    async with dashboard_in_flight.claim(key):
+        version = (_all_months_version, _month_versions[key])
+        metrics = await dashboard_metrics(session, month, year)
+        if version == (_all_months_version, _month_versions[key]):
+            ttl = settings.DASHBOARD_CLOSED_MONTH_TTL_SECONDS if month_is_closed(month, year) else None
+            dashboard_cache.set(key, metrics, ttl=ttl)
+        return metrics
\ No newline at end of file
@@ -1,12 +1,146 @@
 
+import hashlib
+import itertools
+import threading
+import time
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.cache import TTLCache
 from core.config import settings
+from core.logging_config import instrument_engine
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
 
-def create_db_and_tables():
+class PoolWaitStats:
+    """Acumula el tiempo de espera para obtener una conexión y los timeouts del pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+def instrumented_pool_class(base):
+    # Cada engine recibe su propia subclase para no mezclar estadísticas
+    # (el pool se recrea con la misma clase al hacer dispose, así que se conservan)
+    class InstrumentedPool(base):
+        wait_stats = PoolWaitStats()
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.wait_stats.record((time.perf_counter() - started) * 1000, timed_out=True)
+                raise
+            self.wait_stats.record((time.perf_counter() - started) * 1000)
+            return connection
+
+    # el logger del pool se nombra según el módulo; así queda bajo "sqlalchemy" como el original
+    InstrumentedPool.__module__ = base.__module__
+    return InstrumentedPool
+
+
+def pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def async_database_url(url: str) -> str:
+    # Mismo servidor pero con un driver asíncrono
+    driver, rest = url.split("://", 1)
+    dialect = driver.split("+", 1)[0]
+    async_drivers = {"mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+    return f"{async_drivers.get(dialect, driver)}://{rest}"
+
+
+# engine síncrono: tareas de fondo (limpieza de tokens) y creación de tablas
+engine = create_engine(settings.DATABASE_URL, echo=settings.DB_ECHO, poolclass=instrumented_pool_class(QueuePool), **pool_options())
+instrument_engine(engine)
+
+def create_instrumented_async_engine(url: str):
+    async_engine = create_async_engine(url, echo=settings.DB_ECHO, poolclass=instrumented_pool_class(AsyncAdaptedQueuePool), **pool_options())
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+
+# engine asíncrono: lo usan los routers, así un worker atiende muchas peticiones esperando a MySQL
+async_engine = create_instrumented_async_engine(settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL))
+
+# réplicas de solo lectura (opcionales); se reparten en round-robin
+replica_engines = [create_instrumented_async_engine(async_database_url(url)) for url in settings.DATABASE_REPLICA_URLS]
+_replica_cycle = itertools.cycle(replica_engines)
+
+# clientes que escribieron hace poco: leen del primario durante REPLICA_PIN_SECONDS
+# para ver su propia escritura aunque la réplica vaya atrasada
+primary_pins = TTLCache(maxsize=10000, ttl=settings.REPLICA_PIN_SECONDS)
+
+
+def _client_key(request: Request) -> str | None:
+    authorization = request.headers.get("Authorization")
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest() if authorization else None
+
+
+def pin_to_primary(request: Request):
+    key = _client_key(request)
+    if key:
+        primary_pins.set(key, True)
+
+
+def read_engine_for(request: Request):
+    if not replica_engines:
+        return async_engine
+    if request.headers.get("X-Read-Primary", "").lower() in ("1", "true"):
+        return async_engine
+    key = _client_key(request)
+    if key and primary_pins.get(key):
+        return async_engine
+    return next(_replica_cycle)
+
+
+def pool_status(target_engine) -> dict:
+    pool = target_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        **pool.wait_stats.snapshot(),
+    }
+
+def load_models():
+    # registra todos los modelos para que las relaciones entre ellos se resuelvan
     from models.user import User
     from models.user_type import UserType
     from models.reservation import Reservation
@@ -16,10 +150,29 @@ def create_db_and_tables():
     from models.room_type import RoomType
     from models.room_status import RoomStatus
     from models.token import Token
+    from models.room_night import RoomNight
+    from models.idempotency_key import IdempotencyKey
+
+def create_db_and_tables():
+    load_models()
     SQLModel.metadata.create_all(engine)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
-SessionDep = Annotated[Session, Depends(get_session)]
\ No newline at end of file
+SessionDep = Annotated[Session, Depends(get_session)]
+
+async def get_async_session():
+    # expire_on_commit=False: leer atributos después del commit no debe disparar IO implícito
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
+async def get_read_session(request: Request):
+    # Solo para handlers de lectura: puede apuntar a una réplica
+    async with AsyncSession(read_engine_for(request), expire_on_commit=False) as session:
+        yield session
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
\ No newline at end of file
@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.cache import InFlight, TTLCache
+from core.config import settings
+from core.database import async_engine
+from core.security import token_subject
+from models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+@dataclass
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    content_type: str | None
+    body: bytes
+
+
+# respuestas completadas (LRU acotada con TTL) y peticiones en curso de este proceso
+completed = TTLCache(maxsize=settings.IDEMPOTENCY_MAX_KEYS, ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+in_flight = InFlight()
+
+
+def _key_hash(request: Request, key: str) -> str:
+    # la clave vale por usuario y ruta: dos usuarios pueden generar la misma clave sin cruzarse,
+    # y el mismo usuario la conserva aunque vuelva a iniciar sesión y cambie de token
+    subject = token_subject(request.headers.get("Authorization")) or ""
+    scope = "\n".join((subject, request.method, request.url.path, key))
+    return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+
+def _replay(stored: StoredResponse) -> Response:
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type=stored.content_type,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _mismatch() -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": f"{IDEMPOTENCY_HEADER} was already used with a different request body"},
+    )
+
+
+def _in_progress() -> Response:
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": f"A request with this {IDEMPOTENCY_HEADER} is still in progress"},
+    )
+
+
+async def _db_claim(key_hash: str, request_hash: str) -> StoredResponse | None | Response:
+    """Reserva la clave en la tabla. Retorna None si esta petición debe ejecutarse,
+    la respuesta guardada si otra ya terminó, o un error si sigue en curso o el cuerpo no coincide."""
+    deadline = asyncio.get_running_loop().time() + settings.IDEMPOTENCY_WAIT_SECONDS
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        while True:
+            try:
+                session.add(IdempotencyKey(key_hash=key_hash, request_hash=request_hash))
+                await session.commit()
+                if random.random() < 0.01:
+                    await _db_purge_expired(session)
+                return None
+            except IntegrityError:
+                await session.rollback()
+
+            record = await session.get(IdempotencyKey, key_hash, populate_existing=True)
+            if record is None:
+                continue  # se borró entre el INSERT y la lectura: reintentar
+            if record.created_at < datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS):
+                await session.delete(record)
+                await session.commit()
+                continue
+            if record.request_hash != request_hash:
+                return _mismatch()
+            if record.status_code is not None:
+                return StoredResponse(record.request_hash, record.status_code, record.content_type, record.body or b"")
+            if asyncio.get_running_loop().time() >= deadline:
+                return _in_progress()
+            # la petición original corre en otro worker: esperar su resultado
+            await asyncio.sleep(0.1)
+
+
+async def _db_release(key_hash: str, stored: StoredResponse | None):
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        record = await session.get(IdempotencyKey, key_hash)
+        if record is None:
+            return
+        if stored is None:
+            await session.delete(record)  # error del servidor: el cliente puede reintentar con la misma clave
+        else:
+            record.status_code = stored.status_code
+            record.content_type = stored.content_type
+            record.body = stored.body
+            session.add(record)
+        await session.commit()
+
+
+async def _db_purge_expired(session: AsyncSession, batch_size: int = 500):
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    ids = (await session.exec(select(IdempotencyKey.key_hash).where(IdempotencyKey.created_at < cutoff).limit(batch_size))).all()
+    if ids:
+        await session.exec(delete(IdempotencyKey).where(IdempotencyKey.key_hash.in_(ids)))
+        await session.commit()
+
+
+async def idempotent_call(request: Request, call_next) -> Response:
+    """Ejecuta la petición una sola vez por Idempotency-Key; los reintentos reciben la respuesta guardada.
+
+    Un duplicado concurrente espera el resultado de la primera petición en lugar de ejecutarse."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        return await call_next(request)
+    key_hash = _key_hash(request, key)
+    request_hash = hashlib.sha256(await request.body()).hexdigest()
+    use_db = settings.IDEMPOTENCY_BACKEND == "db"
+
+    while True:
+        stored = completed.get(key_hash)
+        if stored is not None:
+            return _replay(stored) if stored.request_hash == request_hash else _mismatch()
+        if not await in_flight.wait(key_hash):
+            break
+
+    async with in_flight.claim(key_hash):
+        claimed_in_db = False
+        stored = None
+        try:
+            if use_db:
+                claimed = await _db_claim(key_hash, request_hash)
+                if isinstance(claimed, Response):
+                    return claimed
+                if claimed is not None:
+                    completed.set(key_hash, claimed)
+                    return _replay(claimed)
+                claimed_in_db = True
+
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            if response.status_code < 500:
+                stored = StoredResponse(request_hash, response.status_code, response.headers.get("content-type"), body)
+                completed.set(key_hash, stored)
+            return Response(content=body, status_code=response.status_code, headers=dict(response.headers))
+        finally:
+            if claimed_in_db:
+                # con stored=None (error o excepción) la clave se libera para permitir el reintento
+                await _db_release(key_hash, stored)
\ No newline at end of file
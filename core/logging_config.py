@@ -0,0 +1,98 @@
+import contextvars
+import logging
+import queue
+import random
+import re
+import time
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+
+from sqlalchemy import event
+
+from core.config import settings
+
+# ruta HTTP en curso; la fija el middleware de app/main.py para los logs de SQL
+current_route: contextvars.ContextVar[str] = contextvars.ContextVar("current_route", default="-")
+
+sql_logger = logging.getLogger("app.sql")
+_listener: QueueListener | None = None
+
+
+class RequestQueryStats:
+    """Sentencias y tiempo de base de datos acumulados durante una petición."""
+
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.time_ms += elapsed_ms
+        self.fingerprints[statement_fingerprint(statement)] += 1
+
+    def repeated(self, limit: int = 5) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limit) if n > 1]
+
+
+# objeto mutable: el middleware lo crea y los eventos del engine lo actualizan
+request_query_stats: contextvars.ContextVar[RequestQueryStats | None] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def statement_fingerprint(statement: str) -> str:
+    # las sentencias ya llevan parámetros ligados; se normalizan espacios y listas IN (...)
+    statement = re.sub(r"\s+", " ", statement).strip()
+    return re.sub(r"\((?:\s*(?:\?|%s|:\w+)\s*,?)+\)", "(?)", statement)
+
+
+def setup_logging():
+    """Envía los logs a una cola; un hilo aparte los escribe para no bloquear las peticiones."""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    root.addHandler(QueueHandler(log_queue))
+    # los mensajes internos de SQLAlchemy (pool, dialecto) solo interesan al depurar con DB_ECHO
+    if not settings.DB_ECHO:
+        logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def instrument_engine(engine):
+    """Mide cada sentencia; registra siempre las lentas y una muestra de las demás y las suma a la petición."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+        if elapsed_ms >= settings.SQL_SLOW_QUERY_MS:
+            sql_logger.warning("Slow query %.1f ms route=%s sql=%s", elapsed_ms, current_route.get(), statement)
+        elif settings.SQL_LOG_SAMPLE_RATE and random.random() < settings.SQL_LOG_SAMPLE_RATE:
+            sql_logger.info("Query %.1f ms route=%s sql=%s", elapsed_ms, current_route.get(), statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
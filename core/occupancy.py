@@ -0,0 +1,36 @@
+import base64
+from datetime import date
+
+import numpy as np
+
+
+def occupancy_grid(room_ids: list[int], intervals, start: date, days: int) -> np.ndarray:
+    """Matriz int8 habitaciones x noches (1 = ocupada) a partir de intervalos (room_id, check_in, check_out).
+
+    Se pinta con un arreglo de diferencias: +1 en la entrada, -1 en la salida y suma acumulada por fila,
+    sin recorrer celda por celda."""
+    grid = np.zeros((len(room_ids), days + 1), dtype=np.int32)
+    if len(intervals) and len(room_ids):
+        room_index = {room_id: index for index, room_id in enumerate(room_ids)}
+        rows = np.array([room_index.get(room_id, -1) for room_id, _, _ in intervals], dtype=np.int64)
+        first = np.array([(check_in - start).days for _, check_in, _ in intervals], dtype=np.int64)
+        last = np.array([(check_out - start).days for _, _, check_out in intervals], dtype=np.int64)
+        # recorta al rango visible y descarta habitaciones fuera de la lista
+        first, last = np.clip(first, 0, days), np.clip(last, 0, days)
+        keep = (rows >= 0) & (first < last)
+        np.add.at(grid, (rows[keep], first[keep]), 1)
+        np.add.at(grid, (rows[keep], last[keep]), -1)
+    return (np.cumsum(grid[:, :days], axis=1) > 0).astype(np.int8)
+
+
+def encode_bitset(row: np.ndarray) -> str:
+    """Una noche por bit (la primera noche es el bit más alto del primer byte), en base64."""
+    return base64.b64encode(np.packbits(row).tobytes()).decode("ascii")
+
+
+def encode_rle(row: np.ndarray) -> list[int]:
+    """Largos de tramos alternos empezando por noches libres: [2, 3, 1] = 2 libres, 3 ocupadas, 1 libre."""
+    changes = np.flatnonzero(np.diff(row)) + 1
+    bounds = np.concatenate(([0], changes, [row.size]))
+    runs = np.diff(bounds).tolist()
+    return [0] + runs if row.size and row[0] else runs
\ No newline at end of file
@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+
+from fastapi import HTTPException, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from models.room import Room
+
+# tabla completa room_id -> precio por noche; update_room la invalida en este proceso
+# y el TTL acota lo que tarda en verse un cambio hecho desde otro worker
+room_price_cache = TTLCache(maxsize=1, ttl=settings.ROOM_PRICE_CACHE_TTL_SECONDS)
+
+
+INVALID_STAY_DETAIL = "check_out must be after check_in"
+
+
+def stay_nights(check_in: date, check_out: date) -> int:
+    # el rango ya viene validado (ensure_valid_stay): siempre al menos una noche
+    return (check_out - check_in).days
+
+
+def is_valid_stay(check_in: date, check_out: date) -> bool:
+    # rango vacío o invertido: no se cruzaría con ninguna reserva y no bloquearía la habitación
+    return check_out > check_in
+
+
+def ensure_valid_stay(check_in: date, check_out: date):
+    if not is_valid_stay(check_in, check_out):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=INVALID_STAY_DETAIL)
+
+
+def calculate_total_reservation(price_per_night: Decimal, check_in: date, check_out: date) -> Decimal:
+    """Regla única de precio de una estancia: precio por noche por número de noches."""
+    return price_per_night * Decimal(stay_nights(check_in, check_out))
+
+
+def invalidate_room_prices():
+    room_price_cache.clear()
+
+
+async def get_room_prices(session: AsyncSession) -> dict[int, Decimal]:
+    prices = room_price_cache.get("prices")
+    if prices is None:
+        prices = dict((await session.exec(select(Room.id, Room.price_per_night))).all())
+        room_price_cache.set("prices", prices)
+    return prices
+
+
+async def quote_stays(session: AsyncSession, stays) -> list[tuple[int | None, Decimal | None, Decimal | None, str | None]]:
+    """Cotiza muchas estancias (room_id, check_in, check_out) con una sola lectura de la tabla de precios.
+
+    Retorna (noches, precio por noche, total, detalle) por estancia; un rango inválido o una habitación
+    inexistente se informan en el detalle de esa estancia sin hacer fallar el resto del lote."""
+    prices = await get_room_prices(session)
+    if any(room_id not in prices for room_id, _, _ in stays):
+        # habitación creada después de cargar la tabla: se recarga una vez
+        invalidate_room_prices()
+        prices = await get_room_prices(session)
+    quotes = []
+    for room_id, check_in, check_out in stays:
+        if not is_valid_stay(check_in, check_out):
+            quotes.append((None, None, None, INVALID_STAY_DETAIL))
+            continue
+        nights = stay_nights(check_in, check_out)
+        price = prices.get(room_id)
+        if price is None:
+            quotes.append((nights, None, None, "Room not found"))
+        else:
+            quotes.append((nights, price, price * Decimal(nights), None))
+    return quotes
\ No newline at end of file
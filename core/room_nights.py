@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+from sqlalchemy import delete, insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.availability import cancelled_status_ids
+from models.reservation import Reservation
+from models.room_night import RoomNight
+
+
+def nights_for(room_id: int, reservation_id: int, check_in: date, check_out: date) -> list[dict]:
+    """Filas de room_night de una estancia: de check_in a la noche anterior a check_out."""
+    return [
+        {"room_id": room_id, "night": check_in + timedelta(days=offset), "reservation_id": reservation_id}
+        for offset in range((check_out - check_in).days)
+    ]
+
+
+async def insert_room_nights(session: AsyncSession, reservations: list[Reservation]):
+    rows = [
+        row
+        for reservation in reservations
+        for row in nights_for(reservation.room_id, reservation.id, reservation.check_in_date, reservation.check_out_date)
+    ]
+    if rows:
+        await session.exec(insert(RoomNight), params=rows)  # executemany
+
+
+async def release_room_nights(session: AsyncSession, reservation: Reservation):
+    """Borra las noches de la reserva en la misma transacción que su escritura (con la habitación bloqueada).
+
+    rebuild_room_nights deja cada noche de reservas antiguas solapadas a una sola de ellas: las noches
+    liberadas pasan a la siguiente reserva activa que también las ocupa, para no mostrarlas libres."""
+    freed = (await session.exec(
+        select(RoomNight.room_id, RoomNight.night).where(RoomNight.reservation_id == reservation.id)
+    )).all()
+    if not freed:
+        return
+    await session.exec(delete(RoomNight).where(RoomNight.reservation_id == reservation.id))
+    room_id = freed[0][0]
+    nights = {night for _, night in freed}
+    neighbours = (await session.exec(
+        select(Reservation.id, Reservation.check_in_date, Reservation.check_out_date)
+        .where(
+            Reservation.room_id == room_id,
+            Reservation.id != reservation.id,
+            Reservation.check_in_date <= max(nights),
+            Reservation.check_out_date > min(nights),
+            Reservation.reservation_status_id.not_in(cancelled_status_ids()),
+        )
+        .order_by(Reservation.check_in_date, Reservation.id)
+    )).all()
+    rows = []
+    for reservation_id, check_in, check_out in neighbours:
+        for row in nights_for(room_id, reservation_id, check_in, check_out):
+            if row["night"] in nights:
+                nights.discard(row["night"])
+                rows.append(row)
+    if rows:
+        await session.exec(insert(RoomNight), params=rows)
+
+def rebuild_room_nights() -> tuple[int, int]:
+    """Regenera room_night desde cero a partir de las reservas activas, habitación por habitación.
+
+    Si dos reservas antiguas se solapan, la noche queda para la que entra primero.
+    Retorna (filas insertadas, noches en conflicto omitidas)."""
+    # importaciones diferidas: solo las necesita el comando de la CLI
+    from sqlmodel import Session
+
+    from core.database import engine, load_models
+    from models.room import Room
+
+    load_models()
+    inserted = 0
+    skipped = 0
+    with Session(engine) as session:
+        session.exec(delete(RoomNight))
+        for room_id in session.exec(select(Room.id).order_by(Room.id)).all():
+            stays = session.exec(
+                select(Reservation.id, Reservation.check_in_date, Reservation.check_out_date)
+                .where(Reservation.room_id == room_id, Reservation.reservation_status_id.not_in(cancelled_status_ids()))
+                .order_by(Reservation.check_in_date, Reservation.id)
+            ).all()
+            rows = []
+            occupied_until = None
+            for reservation_id, check_in, check_out in stays:
+                first_night = check_in if occupied_until is None else max(check_in, occupied_until)
+                if first_night < check_out:
+                    rows.extend(nights_for(room_id, reservation_id, first_night, check_out))
+                skipped += max(0, (min(check_out, first_night) - check_in).days)
+                occupied_until = check_out if occupied_until is None else max(occupied_until, check_out)
+            if rows:
+                session.exec(insert(RoomNight), params=rows)
+                inserted += len(rows)
+        # una sola transacción: las lecturas ven la tabla anterior hasta el final
+        session.commit()
+    return inserted, skipped
\ No newline at end of file
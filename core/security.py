@@ -1,6 +1,11 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from sqlmodel import select
-from core.database import SessionDep
+import hashlib
+from sqlmodel import select, update
+from core.cache import TTLCache
+from core.config import settings
+from core.database import AsyncSessionDep
 from models.user import User
 from typing import Annotated
 from fastapi import Depends
@@ -22,6 +27,40 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES'))
 #instancia de una clase
 outh2_scheme= OAuth2PasswordBearer(tokenUrl="token")
 
+# caché de tokens ya verificados: digest del token -> usuario (copia desconectada de la sesión)
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+# modo epoch: username -> usuario con su token_version vigente
+epoch_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=settings.AUTH_EPOCH_CACHE_TTL_SECONDS)
+
+def invalidate_user_tokens(user_id: int) -> int:
+    # Debe llamarse cuando cambian los tokens, el estado o la contraseña del usuario
+    removed = token_cache.discard_where(lambda user: user.id == user_id)
+    return removed + epoch_cache.discard_where(lambda user: user.id == user_id)
+
+async def bump_token_version(session, user_id: int) -> int:
+    # Revoca todos los tokens emitidos al usuario en modo epoch; el commit lo hace quien llama
+    await session.exec(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return (await session.exec(select(User.token_version).where(User.id == user_id))).one()
+
+async def revoke_user_tokens(session, user_id: int):
+    # contraseña o estado cambiados: cierra todas las sesiones del usuario en ambos modos; el commit lo hace quien llama
+    await session.exec(
+        update(DBToken)
+        .where(DBToken.user_id == user_id, DBToken.status_token == True)
+        .values(status_token=False)
+        .execution_options(synchronize_session=False)
+    )
+    await bump_token_version(session, user_id)
+
 def hash_password(password: str) -> str:
     #Hasheao con  bcrypt
     hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
@@ -34,6 +73,42 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     except ValueError:
         return False
 
+# bcrypt libera el GIL, así que un pool de hilos propio basta para sacar el trabajo
+# del threadpool de AnyIO sin el costo de procesos separados
+password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_password_pending = 0
+_password_completed = 0
+_password_rejected = 0
+
+async def _run_password_task(func, *args):
+    global _password_pending, _password_completed, _password_rejected
+    # Los contadores solo se tocan desde el event loop, no necesitan lock
+    if _password_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        _password_rejected += 1
+        raise HTTPException(status_code=503, detail="Too many password operations in progress, try again later")
+    _password_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+    finally:
+        _password_pending -= 1
+        _password_completed += 1
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_task(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+def password_pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "pending": _password_pending,
+        "queue_depth": max(0, _password_pending - settings.PASSWORD_HASH_WORKERS),
+        "completed": _password_completed,
+        "rejected": _password_rejected,
+    }
+
 def encode_token(data:dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -42,15 +117,59 @@ def encode_token(data:dict):
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token, expire # Retorna el token, la fecha de expiración y fecha de creacion
     
-def decode_token(token: Annotated[str, Depends(outh2_scheme)], session: SessionDep):
+def token_subject(authorization: str | None) -> str | None:
+    # identidad estable del portador sin consultar la base: sobrevive a un nuevo login;
+    # None si no hay token o la firma no es válida
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        data = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if data.get("user_id") is not None:
+        return f"user:{data['user_id']}"
+    username = data.get("username") # tokens emitidos antes de incluir user_id
+    return f"username:{username}" if username is not None else None
+    
+async def check_token_epoch(data: dict, username: str, session) -> User:
+    # El token es válido mientras su token_version coincida con la del usuario;
+    # no se consulta la tabla token en cada petición
+    user = epoch_cache.get(username)
+    token_version = data.get("token_version")
+    if user is not None and isinstance(token_version, int) and token_version > user.token_version:
+        # token emitido después de cargar la caché (p. ej. login en otro worker): se relee el usuario
+        epoch_cache.pop(username)
+        user = None
+    if user is None:
+        user_db = (await session.exec(select(User).where(User.username == username))).first()
+        if user_db is None:
+            raise HTTPException(status_code=404, detail="user not found")
+        user = User.model_validate(user_db.model_dump())
+        epoch_cache.set(username, user)
+    if not user.active:
+        raise HTTPException(status_code=403, detail="User disabled. Please, contact your system manager")
+    if token_version != user.token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked.")
+    return user
+
+async def decode_token(token: Annotated[str, Depends(outh2_scheme)], session: AsyncSessionDep):
     try:
+        digest = token_digest(token)
+        if settings.AUTH_MODE != "epoch":
+            cached_user = token_cache.get(digest)
+            if cached_user is not None:
+                return cached_user
+
         data = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username = data.get('username')
-        print (username)
         if username is None:
             raise HTTPException(status_code=400, detail="The token data is incomplete")
+
+        if settings.AUTH_MODE == "epoch":
+            return await check_token_epoch(data, username, session)
         
-        user_db = session.exec(select(User).where(User.username == username)).first()
+        user_db = (await session.exec(select(User).where(User.username == username))).first()
         
         if user_db is None:
             raise HTTPException(status_code=404, detail="user not found")
@@ -58,16 +177,23 @@ def decode_token(token: Annotated[str, Depends(outh2_scheme)], session: SessionD
             raise HTTPException(status_code=403, detail="User disabled. Please, contact your system manager") 
         
         #Comprobar si el token está activo en la base de datos
-        db_token = session.exec(
+        db_token = (await session.exec(
             select(DBToken)
-            .where(DBToken.token == token, DBToken.user_id == user_db.id, DBToken.status_token == True)
-        ).first()
+            .where(DBToken.token_hash == digest, DBToken.user_id == user_db.id, DBToken.status_token == True)
+        )).first()
 
         if not db_token:
             raise HTTPException(status_code=401, detail="Token has been invalidated or not found in database.")
+
+        # la entrada nunca vive más que el propio token
+        remaining = (db_token.expiration - datetime.utcnow()).total_seconds()
+        if remaining > 0:
+            token_cache.set(digest, User.model_validate(user_db.model_dump()), ttl=min(settings.TOKEN_CACHE_TTL_SECONDS, remaining))
         
         return user_db # Retornar el usuario si el token es válido y activo
 
+    except HTTPException as http_exc:
+        raise http_exc
     except JWTError: #recoleccion de errores especificos
         raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
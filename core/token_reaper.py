@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, or_
+from sqlmodel import Session, select
+
+from core.config import settings
+from core.database import engine
+from models.token import Token
+
+logger = logging.getLogger(__name__)
+
+# resultado de la última ejecución, expuesto en /api/metrics/token-reaper
+last_run: dict = {"removed": 0, "batches": 0, "duration_ms": 0.0, "finished_at": None}
+
+
+def purge_tokens(batch_size: int, max_batches: int) -> tuple[int, int]:
+    """Borra tokens vencidos o invalidados en lotes acotados.
+    Retorna (filas borradas, lotes ejecutados)."""
+    removed = 0
+    batches = 0
+    with Session(engine) as session:
+        while batches < max_batches:
+            ids = session.exec(
+                select(Token.id)
+                .where(or_(Token.status_token == False, Token.expiration < datetime.utcnow()))
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            # cada lote en su propia transacción para no retener locks sobre la tabla
+            session.exec(delete(Token).where(Token.id.in_(ids)))
+            session.commit()
+            removed += len(ids)
+            batches += 1
+            if len(ids) < batch_size:
+                break
+    return removed, batches
+
+
+def run_token_reaper() -> dict:
+    started = time.perf_counter()
+    removed, batches = purge_tokens(settings.TOKEN_REAPER_BATCH_SIZE, settings.TOKEN_REAPER_MAX_BATCHES)
+    duration_ms = (time.perf_counter() - started) * 1000
+    last_run.update(removed=removed, batches=batches, duration_ms=round(duration_ms, 2), finished_at=datetime.utcnow())
+    logger.info("Token reaper removed %s rows in %s batches (%.2f ms)", removed, batches, duration_ms)
+    return last_run
+
+
+async def token_reaper_loop():
+    while True:
+        await asyncio.sleep(settings.TOKEN_REAPER_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(run_token_reaper)
+        except Exception:
+            logger.exception("Token reaper run failed")
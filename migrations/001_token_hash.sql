@@ -0,0 +1,11 @@
+-- Digest SHA-256 del token para búsquedas indexadas en decode_token.
+-- Ejecutar una sola vez sobre bases creadas antes de agregar token.token_hash;
+-- las bases nuevas ya obtienen la columna y los índices con create_all.
+
+ALTER TABLE token ADD COLUMN token_hash VARCHAR(64) NULL;
+
+-- Rellenar las filas existentes (SHA2 de MySQL produce el mismo hex que hashlib.sha256)
+UPDATE token SET token_hash = SHA2(token, 256) WHERE token_hash IS NULL;
+
+CREATE INDEX ix_token_token_hash ON token (token_hash);
+CREATE INDEX ix_token_user_id_status_token ON token (user_id, status_token);
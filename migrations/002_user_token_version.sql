@@ -0,0 +1,4 @@
+-- Versión de tokens por usuario para el modo de autenticación "epoch" (AUTH_MODE=epoch).
+-- Ejecutar una sola vez sobre bases creadas antes de agregar user.token_version.
+
+ALTER TABLE user ADD COLUMN token_version INT NOT NULL DEFAULT 0;
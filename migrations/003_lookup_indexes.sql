@@ -0,0 +1,10 @@
+-- Índices para las consultas frecuentes de reservas (disponibilidad, dashboard) y búsquedas por nombre.
+-- Ejecutar una sola vez sobre bases creadas antes de declararlos en los modelos.
+-- user.username no necesita índice nuevo: su restricción UNIQUE ya crea uno.
+
+CREATE INDEX ix_reservation_room_id_dates ON reservation (room_id, check_in_date, check_out_date);
+CREATE INDEX ix_reservation_client_id ON reservation (client_id);
+CREATE INDEX ix_reservation_check_in_date ON reservation (check_in_date);
+
+CREATE INDEX ix_roomtype_name ON roomtype (name);
+CREATE INDEX ix_roomstatus_name ON roomstatus (name);
@@ -0,0 +1,4 @@
+-- Índice para /api/room/availability: el anti-join recorre solo las reservas de la habitación
+-- que terminan después de la fecha de entrada buscada (pocas, porque casi todas están en el pasado).
+
+CREATE INDEX ix_reservation_room_id_check_out ON reservation (room_id, check_out_date, check_in_date);
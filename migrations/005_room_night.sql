@@ -0,0 +1,15 @@
+-- Tabla de noches ocupadas por habitación, mantenida por los endpoints de reservas.
+-- Ejecutar una sola vez sobre bases existentes y luego llenarla desde las reservas con:
+--   python -m core.cli rebuild-room-nights
+
+CREATE TABLE room_night (
+    room_id INT NOT NULL,
+    night DATE NOT NULL,
+    reservation_id INT NOT NULL,
+    PRIMARY KEY (room_id, night),
+    FOREIGN KEY (room_id) REFERENCES room (id),
+    FOREIGN KEY (reservation_id) REFERENCES reservation (id)
+);
+
+CREATE INDEX ix_room_night_night ON room_night (night);
+CREATE INDEX ix_room_night_reservation_id ON room_night (reservation_id);
@@ -0,0 +1,13 @@
+-- Tabla de respuestas por Idempotency-Key, usada solo con IDEMPOTENCY_BACKEND=db.
+-- Ejecutar una sola vez sobre bases existentes.
+
+CREATE TABLE idempotency_key (
+    key_hash VARCHAR(64) NOT NULL PRIMARY KEY,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INT NULL,
+    content_type VARCHAR(100) NULL,
+    body MEDIUMBLOB NULL,
+    created_at DATETIME NOT NULL
+);
+
+CREATE INDEX ix_idempotency_key_created_at ON idempotency_key (created_at);
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field, Column, LargeBinary
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """Respuesta guardada por Idempotency-Key (solo con IDEMPOTENCY_BACKEND=db)."""
+    __tablename__ = "idempotency_key"  # Nombre explícito de la tabla
+
+    key_hash: str = Field(max_length=64, primary_key=True) # SHA-256 de cliente + ruta + clave
+    request_hash: str = Field(max_length=64) # SHA-256 del cuerpo: la misma clave con otro cuerpo es un error
+    status_code: Optional[int] = Field(default=None) # None mientras la primera petición está en curso
+    content_type: Optional[str] = Field(default=None, max_length=100)
+    body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary(length=2**24 - 1))) # MEDIUMBLOB en MySQL
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
\ No newline at end of file
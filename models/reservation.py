@@ -1,9 +1,21 @@
 from decimal import Decimal
-from sqlmodel import SQLModel, Field, Relationship
-from typing import Optional
+from sqlmodel import SQLModel, Field, Relationship, Index
+from typing import List, Optional, Union
 from datetime import date
 
+from models.client import ClientRead
+from models.reservation_status import ReservationStatusRead
+from models.room import RoomRead
+from models.user import UserPublic
+
 class Reservation(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_reservation_room_id_dates", "room_id", "check_in_date", "check_out_date"), # disponibilidad y solapes por habitación
+        Index("ix_reservation_room_id_check_out", "room_id", "check_out_date", "check_in_date"), # búsquedas a futuro: solo recorre reservas que aún no terminan
+        Index("ix_reservation_client_id", "client_id"),
+        Index("ix_reservation_check_in_date", "check_in_date"), # filtros por mes del dashboard
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     reservation_status_id:int = Field(foreign_key="reservationstatus.id")
@@ -39,6 +51,55 @@ class ReservationRead(ReservationBase):
     class Config:
         from_attributes = True
 
+class ReservationReadExpanded(ReservationRead):
+    # se llenan solo las relaciones pedidas con ?expand=
+    client: Optional[ClientRead] = None
+    room: Optional[RoomRead] = None
+    reservation_status: Optional[ReservationStatusRead] = None
+    user: Optional[UserPublic] = None
+
+class ReservationBulkCreate(SQLModel):
+    reservations: List[ReservationCreate] = Field(min_length=1, max_length=100)
+    atomic: bool = Field(default=True) # True: todo o nada; False: se insertan las válidas y se informa cada item
+
+class ReservationBulkItemResult(SQLModel):
+    index: int
+    status_code: int
+    reservation: Optional[ReservationRead] = None
+    detail: Optional[str] = None
+
+class ReservationBulkResult(SQLModel):
+    created: int
+    results: List[ReservationBulkItemResult]
+
+class ReservationQuoteItem(SQLModel):
+    room_id: int
+    check_in_date: date
+    check_out_date: date
+
+class ReservationQuoteRequest(SQLModel):
+    items: List[ReservationQuoteItem] = Field(min_length=1, max_length=200)
+
+class ReservationQuote(ReservationQuoteItem):
+    nights: Optional[int] = None
+    price_per_night: Optional[Decimal] = None
+    total: Optional[Decimal] = None
+    detail: Optional[str] = None
+
+class ReservationQuoteResult(SQLModel):
+    quotes: List[ReservationQuote]
+
+class RoomOccupancy(SQLModel):
+    room_id: int
+    room_number: str
+    nights: Union[str, List[int]] # bitset en base64 o tramos RLE según encoding
+
+class OccupancyGrid(SQLModel):
+    start: date
+    days: int
+    encoding: str
+    rooms: List[RoomOccupancy]
+
 class ReservationUpdate(SQLModel):
     user_id: Optional[int] = None
     reservation_status_id: Optional[int] = None
@@ -0,0 +1,15 @@
+from datetime import date
+from sqlmodel import SQLModel, Field, Index
+
+
+class RoomNight(SQLModel, table=True):
+    """Una fila por habitación y noche ocupada; se mantiene junto con cada escritura de reservas."""
+    __tablename__ = "room_night"  # Nombre explícito de la tabla
+    __table_args__ = (
+        Index("ix_room_night_night", "night"), # ocupación por noche de todas las habitaciones
+    )
+
+    # la clave (room_id, night) impide además que dos reservas activas ocupen la misma noche
+    room_id: int = Field(foreign_key="room.id", primary_key=True)
+    night: date = Field(primary_key=True)
+    reservation_id: int = Field(foreign_key="reservation.id", index=True)
\ No newline at end of file
@@ -9,7 +9,7 @@ class RoomType(SQLModel, table=True):
     __tablename__ = "roomtype"  # Nombre explícito de la tabla
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    name: str = Field(max_length=30)
+    name: str = Field(max_length=30, index=True)
     description: str = Field(max_length=100)
 
     rooms: List["Room"] = Relationship(back_populates="room_type")
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, Optional, List
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 
 
 class AccessTokenResponse(SQLModel): 
@@ -10,10 +10,14 @@ class AccessTokenResponse(SQLModel):
 
 class Token(SQLModel, table=True):
     __tablename__ = "token" # Nombre de la tabla en la base de datos
+    __table_args__ = (
+        Index("ix_token_user_id_status_token", "user_id", "status_token"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id") 
     token: str
+    token_hash: Optional[str] = Field(default=None, max_length=64, index=True) # SHA-256 del JWT, usado para las búsquedas
     status_token: bool = Field(default=True) # True: activo, False: expirado/invalidado
     expiration: datetime # Fecha y hora de expiración del token
     date_token: datetime = Field(default_factory=datetime.now) 
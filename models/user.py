@@ -4,7 +4,7 @@ from pydantic import EmailStr
 
 
 class UserBase(SQLModel):
-    username: str = Field(max_length=30,unique=True)
+    username: str = Field(max_length=30,unique=True,index=True)
     email: EmailStr = Field(max_length=100,unique=True)
     password: str = Field(max_length=100)
     user_type_id: int = Field(foreign_key="usertype.id") 
@@ -14,6 +14,7 @@ class User(UserBase, table=True):
 
     id: Optional[int] = Field(default=None, primary_key=True)
     active:bool =Field(default=True)
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"}) # se incrementa para revocar los tokens emitidos (modo epoch)
     
 
     reservations: List["Reservation"] = Relationship(back_populates="user")#reservationf
@@ -39,6 +40,14 @@ class UserRead(UserBase):
     id: int
 
 
+class UserPublic(SQLModel):
+    # sin password: es el modelo anidado en las reservas expandidas
+    id: int
+    username: str
+    email: EmailStr
+    user_type_id: int
+    active: bool
+
 class PasswordUpdate(SQLModel):
     password: str = Field(max_length=100)
 
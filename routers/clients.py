@@ -3,16 +3,16 @@ from pydantic import ValidationError
 from sqlmodel import desc, select
 from core.security import decode_token
 from models.client import Client, ClientCreate, ClientStatus, ClientUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep, ReadSessionDep
 
 router = APIRouter()
 
 
 # lista de tipos de usuario
 @router.get("/api/client", response_model=list[Client], tags=["CLIENT"],dependencies=[(Depends(decode_token))])
-def list_client(session: SessionDep):
+async def list_client(session: ReadSessionDep):
     try:
-        clients = session.exec(select(Client).order_by(desc(Client.id))).all()
+        clients = (await session.exec(select(Client).order_by(desc(Client.id)))).all()
         return clients
     except Exception as e:
         raise HTTPException(
@@ -22,9 +22,9 @@ def list_client(session: SessionDep):
 
 # obtener tipo de usuario por id para listar
 @router.get("/api/client/{client_id}", response_model=Client, tags=["CLIENT"],dependencies=[(Depends(decode_token))])
-def read_client(client_id: int, session: SessionDep):
+async def read_client(client_id: int, session: AsyncSessionDep):
     try:
-        client_db = session.get(Client, client_id)
+        client_db = await session.get(Client, client_id)
         if not client_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Client doesn't exist"
@@ -39,36 +39,36 @@ def read_client(client_id: int, session: SessionDep):
 
 # crear tipo de usuario
 @router.post("/api/client", response_model=Client, status_code=status.HTTP_201_CREATED, tags=["CLIENT"],dependencies=[(Depends(decode_token))])
-def create_client(client_data: ClientCreate, session: SessionDep):
+async def create_client(client_data: ClientCreate, session: AsyncSessionDep):
    
     try:
         # Validate data base
         client = Client.model_validate(client_data.model_dump())
 
         # Check for uniqueness of phone, email, and number_identification
-        existing_phone = session.exec(select(Client).where(Client.phone == client.phone)).first()
+        existing_phone = (await session.exec(select(Client).where(Client.phone == client.phone))).first()
         if existing_phone:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Phone number already registered"
             )
 
-        existing_email = session.exec(select(Client).where(Client.email == client.email)).first()
+        existing_email = (await session.exec(select(Client).where(Client.email == client.email))).first()
         if existing_email:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
             )
 
-        existing_identification = session.exec(
+        existing_identification = (await session.exec(
             select(Client).where(Client.number_identification == client.number_identification)
-        ).first()
+        )).first()
         if existing_identification:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Number identification already registered"
             )
 
         session.add(client)
-        session.commit()
-        session.refresh(client)
+        await session.commit()
+        await session.refresh(client)
         return client
     except HTTPException as http_exc:
         # Re-raise HTTPExceptions to avoid them being caught by the general Exception handler
@@ -88,9 +88,9 @@ def create_client(client_data: ClientCreate, session: SessionDep):
 
 #actualizar estado de usuario
 @router.patch("/api/client/{client_id}/status", response_model=dict, status_code=status.HTTP_200_OK, tags=["CLIENT"],dependencies=[(Depends(decode_token))])
-def update_client_status(client_id: int, status_update: ClientStatus, session: SessionDep):
+async def update_client_status(client_id: int, status_update: ClientStatus, session: AsyncSessionDep):
     try:
-        client_db = session.get(Client, client_id)
+        client_db = await session.get(Client, client_id)
         if not client_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Client doesn't exist"
@@ -104,8 +104,8 @@ def update_client_status(client_id: int, status_update: ClientStatus, session: S
 
         client_db.active = status_update.active       
         session.add(client_db)
-        session.commit()
-        session.refresh(client_db)
+        await session.commit()
+        await session.refresh(client_db)
 
         return {"message": f"Client  '{client_db.first_name} {client_db.last_name}' has successfully updated their status to: {client_db.active}"}
     except HTTPException as http_exc:
@@ -119,10 +119,10 @@ def update_client_status(client_id: int, status_update: ClientStatus, session: S
 
 # obtener tipo de usuario por id para actualizar
 @router.patch("/api/client/{client_id}", response_model=Client, status_code=status.HTTP_200_OK, tags=["CLIENT"],dependencies=[(Depends(decode_token))])
-def update_client(client_id: int, client_data: ClientUpdate, session: SessionDep):
+async def update_client(client_id: int, client_data: ClientUpdate, session: AsyncSessionDep):
 
     try:
-        client_db = session.get(Client, client_id)
+        client_db = await session.get(Client, client_id)
         if not client_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Client doesn't exist"
@@ -132,23 +132,23 @@ def update_client(client_id: int, client_data: ClientUpdate, session: SessionDep
 
         # Check for uniqueness before updating
         if "phone" in client_data_dict and client_data_dict["phone"] != client_db.phone:
-            existing_phone = session.exec(select(Client).where(Client.phone == client_data_dict["phone"])).first()
+            existing_phone = (await session.exec(select(Client).where(Client.phone == client_data_dict["phone"]))).first()
             if existing_phone and existing_phone.id != client_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Phone number already registered"
                 )
 
         if "email" in client_data_dict and client_data_dict["email"] != client_db.email:
-            existing_email = session.exec(select(Client).where(Client.email == client_data_dict["email"])).first()
+            existing_email = (await session.exec(select(Client).where(Client.email == client_data_dict["email"]))).first()
             if existing_email and existing_email.id != client_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
                 )
 
         if "number_identification" in client_data_dict and client_data_dict["number_identification"] != client_db.number_identification:
-            existing_identification = session.exec(
+            existing_identification = (await session.exec(
                 select(Client).where(Client.number_identification == client_data_dict["number_identification"])
-            ).first()
+            )).first()
             if existing_identification and existing_identification.id != client_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Number identification already registered"
@@ -156,8 +156,8 @@ def update_client(client_id: int, client_data: ClientUpdate, session: SessionDep
 
         client_db.sqlmodel_update(client_data_dict)
         session.add(client_db)
-        session.commit()
-        session.refresh(client_db)
+        await session.commit()
+        await session.refresh(client_db)
         return client_db
     except ValueError as ve:
         raise HTTPException(
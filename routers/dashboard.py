@@ -1,76 +1,32 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, extract
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
-from decimal import Decimal
 from fastapi.responses import FileResponse
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 import os
 
-from core.database import SessionDep
+from core.dashboard import cached_dashboard_metrics
+from core.database import AsyncSessionDep
 from core.security import decode_token
-from models.reservation import Reservation
-from models.client import Client
-from models.room import Room
 
 router = APIRouter()
 
-@router.get("/api/dashboard", tags=["DASHBOARD"],dependencies=[(Depends(decode_token))])
-def get_dashboard_data(
-    session: SessionDep,
-    month: int = Query(default=datetime.now().month, ge=1, le=12),
-    year: int = Query(default=datetime.now().year)
-):
-    # Total Recaudado
-    total_recaudo = session.query(func.sum(Reservation.total))\
-        .filter(extract('month', Reservation.check_in_date) == month)\
-        .filter(extract('year', Reservation.check_in_date) == year)\
-        .scalar() or Decimal(0.00)
-
-    # Total de Habitaciones
-    total_habitaciones = session.query(func.count(Room.id)).scalar() or 1  # evitar división por cero
-
-    # Habitaciones reservadas en el mes
-    habitaciones_reservadas = session.query(func.count(Reservation.id))\
-        .filter(extract('month', Reservation.check_in_date) == month)\
-        .filter(extract('year', Reservation.check_in_date) == year)\
-        .scalar() or 0
-
-    # Porcentaje de ocupación
-    porcentaje_ocupacion = (habitaciones_reservadas / total_habitaciones) * 100
+# datos con los que se generó cada PDF en este proceso: si no cambiaron se sirve el archivo existente
+rendered_reports: dict[str, dict] = {}
 
-    # Promedio de días reservados
-    promedio_dias = session.query(
-        func.avg(func.datediff(Reservation.check_out_date, Reservation.check_in_date))
-    )\
-        .filter(extract('month', Reservation.check_in_date) == month)\
-        .filter(extract('year', Reservation.check_in_date) == year)\
-        .scalar() or 0
-
-    # Total de clientes en el mes
-    total_clientes = session.query(func.count(func.distinct(Reservation.client_id)))\
-        .filter(extract('month', Reservation.check_in_date) == month)\
-        .filter(extract('year', Reservation.check_in_date) == year)\
-        .scalar() or 0
-
-    return {
-        "total_recaudo": float(total_recaudo),
-        "porcentaje_ocupacion": round(porcentaje_ocupacion, 2),
-        "promedio_dias": round(promedio_dias, 2),
-        "total_clientes": total_clientes
-    }
-
-@router.get("/api/dashboard/pdf", tags=["DASHBOARD"])
-def generate_dashboard_pdf(
-    session: SessionDep,
+# sesión del primario: lo que se calcula queda en caché y una réplica atrasada dejaría cifras previas a la
+# última escritura; los aciertos de caché no consultan la base
+@router.get("/api/dashboard", tags=["DASHBOARD"],dependencies=[(Depends(decode_token))])
+async def get_dashboard_data(
+    session: AsyncSessionDep,
     month: int = Query(default=datetime.now().month, ge=1, le=12),
     year: int = Query(default=datetime.now().year)
 ):
-    dashboard = get_dashboard_data(session, month, year)
+    return await cached_dashboard_metrics(session, month, year)
 
-    filename = f"dashboard_report_{month}_{year}.pdf"
-    filepath = os.path.join("static", filename)
-    os.makedirs("static", exist_ok=True)
+def write_dashboard_pdf(filepath: str, dashboard: dict, month: int, year: int):
+    # reportlab se importa al generar el primer PDF para no cargarlo en cada arranque
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
 
     c = canvas.Canvas(filepath, pagesize=letter)
     width, height = letter
@@ -96,4 +52,21 @@ def generate_dashboard_pdf(
         y -= 25
 
     c.save()
+
+@router.get("/api/dashboard/pdf", tags=["DASHBOARD"])
+async def generate_dashboard_pdf(
+    session: AsyncSessionDep,
+    month: int = Query(default=datetime.now().month, ge=1, le=12),
+    year: int = Query(default=datetime.now().year)
+):
+    dashboard = await get_dashboard_data(session, month, year)
+
+    filename = f"dashboard_report_{month}_{year}.pdf"
+    filepath = os.path.join("static", filename)
+    os.makedirs("static", exist_ok=True)
+
+    if rendered_reports.get(filepath) != dashboard or not os.path.exists(filepath):
+        # reportlab escribe el archivo de forma síncrona: fuera del event loop
+        await run_in_threadpool(write_dashboard_pdf, filepath, dashboard, month, year)
+        rendered_reports[filepath] = dashboard
     return FileResponse(filepath, media_type="application/pdf", filename=filename)
\ No newline at end of file
@@ -1,8 +1,10 @@
 from datetime import datetime
-from fastapi import APIRouter, status, HTTPException
-from sqlmodel import select
-from core.database import SessionDep
-from core.security import encode_token , ACCESS_TOKEN_EXPIRE_MINUTES, verify_password
+from typing import Annotated
+from fastapi import APIRouter, Depends, status, HTTPException
+from sqlmodel import select, update
+from core.config import settings
+from core.database import AsyncSessionDep
+from core.security import encode_token , ACCESS_TOKEN_EXPIRE_MINUTES, verify_password_async, invalidate_user_tokens, token_digest, bump_token_version, decode_token, outh2_scheme
 from models.user import  User, UserLogin
 from models.token import AccessTokenResponse,Token as DBToken
 
@@ -10,9 +12,9 @@ router = APIRouter()
 
 
 @router.post("/api/login", tags=["AUTH"], response_model=AccessTokenResponse)
-def login(user_data:UserLogin,session: SessionDep):
+async def login(user_data:UserLogin,session: AsyncSessionDep):
     try:
-        user_db = session.exec(select(User).where(User.username == user_data.username)).first()
+        user_db = (await session.exec(select(User).where(User.username == user_data.username))).first()
 
         if not user_db:
             raise HTTPException(
@@ -21,32 +23,40 @@ def login(user_data:UserLogin,session: SessionDep):
             )
         
         #verificador de clave
-        if not verify_password(user_data.password, user_db.password):
+        if not await verify_password_async(user_data.password, user_db.password):
             raise HTTPException(status_code=400,detail="Invalid credentials")
         
-        # invalidar tokens y crear uno nuevo
-        existing_tokens = session.exec(
-            select(DBToken).where(DBToken.user_id == user_db.id, DBToken.status_token == True)
-        ).all()
-        for token_entry in existing_tokens:
-            token_entry.status_token = False
-            session.add(token_entry)
-        session.commit() # Guarda los cambios de invalidación
-
-        # Crea un nuevo token 
-        encoded_jwt, expires_at = encode_token({"username": user_data.username, "email": user_db.email})
-
-        # Almacena el nuevo token en la base de datos
-        new_token_db = DBToken(
-            token=encoded_jwt,
-            user_id=user_db.id,
-            expiration=expires_at,
-            status_token=True,
-            date_token=datetime.utcnow()
-        )
-        session.add(new_token_db)
-        session.commit()
-        session.refresh(new_token_db)
+        user_id = user_db.id
+        token_data = {"user_id": user_id, "username": user_data.username, "email": user_db.email}
+
+        if settings.AUTH_MODE == "epoch":
+            # En modo epoch no se escribe en la tabla token: subir la versión revoca los tokens anteriores
+            token_data["token_version"] = await bump_token_version(session, user_id)
+            encoded_jwt, expires_at = encode_token(token_data)
+            await session.commit()
+        else:
+            # Crea un nuevo token 
+            token_data["token_version"] = user_db.token_version
+            encoded_jwt, expires_at = encode_token(token_data)
+
+            # invalidar tokens anteriores (un solo UPDATE) y guardar el nuevo en la misma transacción
+            await session.exec(
+                update(DBToken)
+                .where(DBToken.user_id == user_id, DBToken.status_token == True)
+                .values(status_token=False)
+                .execution_options(synchronize_session=False)
+            )
+            new_token_db = DBToken(
+                token=encoded_jwt,
+                token_hash=token_digest(encoded_jwt),
+                user_id=user_id,
+                expiration=expires_at,
+                status_token=True,
+                date_token=datetime.utcnow()
+            )
+            session.add(new_token_db)
+            await session.commit()
+        invalidate_user_tokens(user_id) # Saca de la caché los tokens anteriores
 
         return {"acces_token": encoded_jwt, "token_type": "bearer"} 
     
@@ -57,3 +67,27 @@ def login(user_data:UserLogin,session: SessionDep):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred during login: {str(e)}",
         )
+
+
+
+# cerrar sesión: revoca el token actual (modo db) o todos los del usuario (modo epoch)
+@router.post("/api/logout", tags=["AUTH"], response_model=dict)
+async def logout(token: Annotated[str, Depends(outh2_scheme)], user: Annotated[User, Depends(decode_token)], session: AsyncSessionDep):
+    try:
+        if settings.AUTH_MODE == "epoch":
+            await bump_token_version(session, user.id)
+        else:
+            await session.exec(
+                update(DBToken)
+                .where(DBToken.token_hash == token_digest(token), DBToken.user_id == user.id)
+                .values(status_token=False)
+                .execution_options(synchronize_session=False)
+            )
+        await session.commit()
+        invalidate_user_tokens(user.id)
+        return {"detail": "Logged out successfully"}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred during logout: {str(e)}",
+        )
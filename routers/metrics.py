@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+
+from core import token_reaper
+from core.config import settings
+from core.database import async_engine, engine, pool_status, replica_engines
+from core.security import decode_token, password_pool_stats
+
+router = APIRouter()
+
+
+# estado del pool de bcrypt (operaciones pendientes y en cola)
+@router.get("/api/metrics/password-pool", response_model=dict, tags=["METRICS"],dependencies=[(Depends(decode_token))])
+def read_password_pool_metrics():
+    return password_pool_stats()
+
+
+# resultado de la última limpieza de la tabla token
+@router.get("/api/metrics/token-reaper", response_model=dict, tags=["METRICS"],dependencies=[(Depends(decode_token))])
+def read_token_reaper_metrics():
+    return {**token_reaper.last_run, "interval_seconds": settings.TOKEN_REAPER_INTERVAL_SECONDS}
+
+
+# estado del pool de conexiones a la base de datos
+@router.get("/api/metrics/db-pool", response_model=dict, tags=["METRICS"],dependencies=[(Depends(decode_token))])
+def read_db_pool_metrics():
+    return {
+        "async": pool_status(async_engine.sync_engine),
+        "sync": pool_status(engine),
+        "replicas": [pool_status(replica.sync_engine) for replica in replica_engines],
+    }
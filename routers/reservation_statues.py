@@ -4,16 +4,16 @@ from sqlmodel import select
 
 from core.security import decode_token
 from models.reservation_status import ReservationStatus, ReservationStatusCreate, ReservationStatusUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep
 
 router = APIRouter()
 
 
 # lista de estados de reserva
 @router.get("/api/reservationstatus", response_model=list[ReservationStatus], tags=["RESERVATION STATUS"],dependencies=[(Depends(decode_token))])
-def list_reservation_status(session: SessionDep):
+async def list_reservation_status(session: AsyncSessionDep):
     try:
-        return session.exec(select(ReservationStatus)).all()# esto ejecuta transacciones de sql
+        return (await session.exec(select(ReservationStatus))).all()# esto ejecuta transacciones de sql
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -22,10 +22,10 @@ def list_reservation_status(session: SessionDep):
 
 # obtener estado de reserva por id para listar
 @router.get("/api/reservationstatus/{reservationstatus_id}", response_model=ReservationStatus, tags=["RESERVATION STATUS"],dependencies=[(Depends(decode_token))])
-def read_reservation_status(reservationstatus_id: int, session: SessionDep):
+async def read_reservation_status(reservationstatus_id: int, session: AsyncSessionDep):
     try:
     
-        reservationstatus_db = session.get(ReservationStatus, reservationstatus_id)
+        reservationstatus_db = await session.get(ReservationStatus, reservationstatus_id)
         if not reservationstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Reservation status doesn't exist"
@@ -39,20 +39,20 @@ def read_reservation_status(reservationstatus_id: int, session: SessionDep):
 
 # crear estado de reserva
 @router.post("/api/reservationstatus", response_model=ReservationStatus, status_code=status.HTTP_201_CREATED, tags=["RESERVATION STATUS"],dependencies=[(Depends(decode_token))])
-def create_reservation_status(reservation_status_data: ReservationStatusCreate, session: SessionDep):
+async def create_reservation_status(reservation_status_data: ReservationStatusCreate, session: AsyncSessionDep):
    
 
     
     try:
             reservation_status = ReservationStatus.model_validate(reservation_status_data.model_dump())
-            existing_reservationstatus = session.exec(select(ReservationStatus).where(ReservationStatus.name == reservation_status.name)).first()
+            existing_reservationstatus = (await session.exec(select(ReservationStatus).where(ReservationStatus.name == reservation_status.name))).first()
             if existing_reservationstatus:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Room status name already exists"
                 )
             session.add(reservation_status)# insertamos datos
-            session.commit()# conectamos la bd
-            session.refresh(reservation_status)# refrescamos despues de insertar datos
+            await session.commit()# conectamos la bd
+            await session.refresh(reservation_status)# refrescamos despues de insertar datos
             return reservation_status
     except ValidationError as ve:
         raise HTTPException(
@@ -73,15 +73,15 @@ def create_reservation_status(reservation_status_data: ReservationStatusCreate,
 
 # obtener reservation_status por id para eliminar
 @router.delete("/api/reservationstatus/{reservationstatus_id}", status_code=status.HTTP_200_OK, tags=["RESERVATION STATUS"],dependencies=[(Depends(decode_token))])
-def delete_reservation_status(reservationstatus_id: int, session: SessionDep):
+async def delete_reservation_status(reservationstatus_id: int, session: AsyncSessionDep):
     try:
-        reservationstatus_db = session.get(ReservationStatus, reservationstatus_id)
+        reservationstatus_db = await session.get(ReservationStatus, reservationstatus_id)
         if not reservationstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Reservation status doesn't exist"
             )
-        session.delete(reservationstatus_db)
-        session.commit()
+        await session.delete(reservationstatus_db)
+        await session.commit()
         return {"detail": "Reservation Status deleted succesfully"}
     except Exception as e:
             raise HTTPException(
@@ -90,18 +90,18 @@ def delete_reservation_status(reservationstatus_id: int, session: SessionDep):
             )
 # obtener estado de reserva por id para actualizar
 @router.patch("/api/reservationstatus/{reservationstatus_id}", response_model=ReservationStatus, tags=["RESERVATION STATUS"],dependencies=[(Depends(decode_token))])
-def update_reservation_status( reservationstatus_id: int, reservation_status_data: ReservationStatusUpdate, session: SessionDep):
+async def update_reservation_status( reservationstatus_id: int, reservation_status_data: ReservationStatusUpdate, session: AsyncSessionDep):
     
     try:
     
-        reservationstatus_db = session.get(ReservationStatus, reservationstatus_id)
+        reservationstatus_db = await session.get(ReservationStatus, reservationstatus_id)
         if not reservationstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Reservation status doesn't exist"
             )# status.http y el codigo y detail es para el mensaje que retorna
         reservation_status_data_dict = reservation_status_data.model_dump(exclude_unset=True)
         if "name" in reservation_status_data_dict and reservation_status_data_dict["name"] != reservationstatus_db.name:
-            existing_roomstatus = session.exec(select(ReservationStatus).where(ReservationStatus.name == reservation_status_data_dict["name"])).first()
+            existing_roomstatus = (await session.exec(select(ReservationStatus).where(ReservationStatus.name == reservation_status_data_dict["name"]))).first()
             if existing_roomstatus and existing_roomstatus.id != reservationstatus_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Room status name already exists"
@@ -110,8 +110,8 @@ def update_reservation_status( reservationstatus_id: int, reservation_status_dat
        
         reservationstatus_db.sqlmodel_update(reservation_status_data_dict)
         session.add(reservationstatus_db)
-        session.commit()
-        session.refresh(reservationstatus_db)
+        await session.commit()
+        await session.refresh(reservationstatus_db)
         return reservationstatus_db
     
     except ValidationError as ve:
@@ -1,53 +1,78 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
-from sqlmodel import Session, desc, select
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import desc, select
 from typing import List, Optional
 from decimal import Decimal
-from datetime import date
+from datetime import date, timedelta
 
-from core.database import SessionDep
+from core.availability import active_reservations_in_range, cancelled_status_ids, ensure_room_available, is_cancelled_status, lock_rooms
+from core.config import settings
+from core.dashboard import invalidate_dashboard
+from core.database import AsyncSessionDep, ReadSessionDep, read_engine_for
+from core.pricing import calculate_total_reservation, quote_stays
+from core.room_nights import insert_room_nights, release_room_nights
 from core.security import decode_token
+from models.client import Client
 from models.room import Room  # Asegúrate de que este modelo exista
-from models.reservation import Reservation, ReservationCreate, ReservationRead, ReservationUpdate
+from models.reservation import (
+    OccupancyGrid, Reservation, ReservationBulkCreate, ReservationBulkItemResult, ReservationBulkResult,
+    ReservationCreate, ReservationQuote, ReservationQuoteRequest, ReservationQuoteResult, ReservationRead,
+    ReservationReadExpanded, ReservationUpdate, RoomOccupancy,
+)
+from models.reservation_status import ReservationStatus
+from models.user import User
 
 router = APIRouter()
 
-def calculate_total_reservation(session: Session, reservation: Reservation) -> Decimal:
-    """Calcula el total de la reserva basado en las fechas y el precio por noche de la habitación,
-    asegurando que la duración mínima sea de 1 día."""
-    try:
-        room = session.exec(select(Room).where(Room.id == reservation.room_id)).first()
-        if room:
-            duration = reservation.check_out_date - reservation.check_in_date
-            
-            # Si la duración es 0 se establece en 1 día.
-            # Esto maneja casos donde check_in_date y check_out_date son el mismo día.
-            num_days = max(1, duration.days)
-            
-            total = room.price_per_night * Decimal(num_days)
-
-            return total
-        return Decimal("0.00") # <--- Esto se devuelve si la habitación no se encuentra
-    except ValueError as ve:
+# valores de ?expand= y la relación que cargan
+EXPANDABLE_RELATIONS = {
+    "client": Reservation.client,
+    "room": Reservation.room,
+    "status": Reservation.reservation_status,
+    "user": Reservation.user,
+}
+
+def parse_expand(expand: Optional[str]) -> list[str]:
+    names = [name.strip() for name in (expand or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPANDABLE_RELATIONS]
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid input data: {str(ve)}"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error calculating total: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown expand value(s): {', '.join(unknown)}. Allowed: {', '.join(EXPANDABLE_RELATIONS)}",
         )
+    return names
+
+def expand_options(names: list[str]) -> list:
+    # selectinload: una consulta extra por relación, sin importar cuántas reservas haya
+    return [selectinload(EXPANDABLE_RELATIONS[name]) for name in names]
+
+def to_expanded(reservation: Reservation, names: list[str]) -> ReservationReadExpanded:
+    data = reservation.model_dump()
+    for name in names:
+        relation = EXPANDABLE_RELATIONS[name].key
+        data[relation] = getattr(reservation, relation)  # ya cargada: no dispara IO
+    return ReservationReadExpanded.model_validate(data)
 
 # POST para crear una nueva reserva
 @router.post("/api/reservations/", response_model=ReservationRead, status_code=status.HTTP_201_CREATED, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
-def create_reservation(reservation_create: ReservationCreate, session: SessionDep):
+async def create_reservation(reservation_create: ReservationCreate, session: AsyncSessionDep):
     try:
-        #  Calcula el total antes de crear la instancia de la reserva.
-        room = session.get(Room, reservation_create.room_id)
+        # bloquea solo esta habitación: reservas de otras habitaciones siguen en paralelo
+        room = (await lock_rooms(session, [reservation_create.room_id])).get(reservation_create.room_id)
         if not room:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Room not found")
-        duration = reservation_create.check_out_date - reservation_create.check_in_date
-        total = room.price_per_night * Decimal(duration.days)
+        occupies_room = await ensure_room_available(
+            session, room, reservation_create.check_in_date, reservation_create.check_out_date,
+            reservation_create.reservation_status_id,
+        )
+        #  Calcula el total antes de crear la instancia de la reserva (precio de la fila bloqueada).
+        total = calculate_total_reservation(room.price_per_night, reservation_create.check_in_date, reservation_create.check_out_date)
         db_reservation = Reservation(
             user_id=reservation_create.user_id,
             reservation_status_id=reservation_create.reservation_status_id,
@@ -60,9 +85,15 @@ def create_reservation(reservation_create: ReservationCreate, session: SessionDe
         )
 
         session.add(db_reservation)
-        session.commit()
-        session.refresh(db_reservation)
+        await session.flush()  # asigna el id para room_night
+        if occupies_room:
+            await insert_room_nights(session, [db_reservation])
+        await session.commit()
+        invalidate_dashboard(db_reservation.check_in_date)
+        await session.refresh(db_reservation)
         return db_reservation
+    except HTTPException as http_exc:
+        raise http_exc
     except ValidationError as ve:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -78,14 +109,220 @@ def create_reservation(reservation_create: ReservationCreate, session: SessionDe
             detail=f"Error creating reservation: {str(e)}"
         )
 
+# POST para crear varias reservas (grupos y eventos) en una sola transacción
+@router.post("/api/reservations/bulk", response_model=ReservationBulkResult, status_code=status.HTTP_201_CREATED, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def create_reservations_bulk(bulk: ReservationBulkCreate, session: AsyncSessionDep):
+    try:
+        items = bulk.reservations
+        # una consulta por tabla: habitaciones (bloqueadas), clientes, usuarios, estados y reservas existentes
+        rooms = await lock_rooms(session, [item.room_id for item in items])
+        client_ids = set((await session.exec(select(Client.id).where(Client.id.in_({item.client_id for item in items})))).all())
+        user_ids = set((await session.exec(select(User.id).where(User.id.in_({item.user_id for item in items})))).all())
+        status_ids = set((await session.exec(
+            select(ReservationStatus.id).where(ReservationStatus.id.in_({item.reservation_status_id for item in items}))
+        )).all())
+        cancelled_ids = set((await session.exec(cancelled_status_ids())).all())
+        booked = await active_reservations_in_range(
+            session, rooms, min(item.check_in_date for item in items), max(item.check_out_date for item in items)
+        )
+
+        results: list[ReservationBulkItemResult] = []
+        accepted: list[tuple[int, Reservation]] = []
+        for index, item in enumerate(items):
+            room = rooms.get(item.room_id)
+            if item.check_out_date <= item.check_in_date:
+                error = (status.HTTP_400_BAD_REQUEST, "check_out must be after check_in")
+            elif room is None:
+                error = (status.HTTP_400_BAD_REQUEST, "Room not found")
+            elif item.client_id not in client_ids:
+                error = (status.HTTP_400_BAD_REQUEST, "Client not found")
+            elif item.user_id not in user_ids:
+                error = (status.HTTP_400_BAD_REQUEST, "User not found")
+            elif item.reservation_status_id not in status_ids:
+                error = (status.HTTP_400_BAD_REQUEST, "Reservation status not found")
+            else:
+                error = None
+                if item.reservation_status_id not in cancelled_ids:
+                    # cruces contra la base y contra los items ya aceptados del mismo lote
+                    others = booked + [reservation for _, reservation in accepted if reservation.reservation_status_id not in cancelled_ids]
+                    if any(
+                        other.room_id == item.room_id
+                        and other.check_in_date < item.check_out_date
+                        and other.check_out_date > item.check_in_date
+                        for other in others
+                    ):
+                        error = (status.HTTP_409_CONFLICT, f"Room {item.room_id} is already booked between {item.check_in_date} and {item.check_out_date}")
+            if error:
+                results.append(ReservationBulkItemResult(index=index, status_code=error[0], detail=error[1]))
+                continue
+
+            reservation = Reservation.model_validate(item.model_dump())
+            reservation.total = calculate_total_reservation(room.price_per_night, item.check_in_date, item.check_out_date)
+            accepted.append((index, reservation))
+
+        if bulk.atomic and len(accepted) < len(items):
+            failed = [result.model_dump(exclude_none=True) for result in results]
+            raise HTTPException(status_code=failed[0]["status_code"], detail=failed)
+
+        if accepted:
+            # con las habitaciones bloqueadas, toda reserva nueva de ellas con id > last_id es de este lote
+            last_id = (await session.exec(select(func.max(Reservation.id)).where(Reservation.room_id.in_(rooms)))).one() or 0
+            await session.exec(
+                insert(Reservation),
+                params=[reservation.model_dump(exclude={"id"}) for _, reservation in accepted],
+            )  # executemany: un solo INSERT para todo el lote
+            created = (await session.exec(
+                select(Reservation).where(Reservation.room_id.in_(rooms), Reservation.id > last_id).order_by(Reservation.id)
+            )).all()
+            await insert_room_nights(session, [reservation for reservation in created if reservation.reservation_status_id not in cancelled_ids])
+            await session.commit()
+            invalidate_dashboard(*(reservation.check_in_date for reservation in created))
+            # los ids se asignan en el orden de inserción
+            results.extend(
+                ReservationBulkItemResult(index=index, status_code=status.HTTP_201_CREATED, reservation=ReservationRead.model_validate(reservation))
+                for (index, _), reservation in zip(accepted, created)
+            )
+        results.sort(key=lambda result: result.index)
+        return ReservationBulkResult(created=len(accepted), results=results)
+    except HTTPException as http_exc:
+        raise http_exc
+    except ValidationError as ve:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid input data: {str(ve)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating reservations: {str(e)}"
+        )
+
+async def stream_reservations(engine, export_format: str, check_in_from: Optional[date], check_in_to: Optional[date]):
+    """Genera la exportación por lotes desde un cursor del servidor; la memoria no crece con el número de filas."""
+    columns = list(Reservation.__table__.columns)
+    query = select(*columns).order_by(Reservation.id)
+    if check_in_from is not None:
+        query = query.where(Reservation.check_in_date >= check_in_from)
+    if check_in_to is not None:
+        query = query.where(Reservation.check_in_date < check_in_to)
+    names = [column.name for column in columns]
+
+    # conexión propia: la sesión de la petición se cierra antes de enviar el cuerpo
+    async with engine.connect() as connection:
+        result = await connection.stream(query.execution_options(yield_per=settings.RESERVATION_EXPORT_BATCH_SIZE))
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            yield buffer.getvalue()
+        async for rows in result.partitions():
+            buffer = io.StringIO()
+            # Decimal en notación fija para no perder precisión (ni salir como 0E-10)
+            rows = [[format(value, "f") if isinstance(value, Decimal) else value for value in row] for row in rows]
+            if export_format == "csv":
+                csv.writer(buffer).writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(names, row)), default=str) + "\n")
+            yield buffer.getvalue()
+
+# GET para exportar reservas en CSV o NDJSON (declarada antes de /api/reservations/{reservation_id})
+@router.get("/api/reservations/export", tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def export_reservations(
+    request: Request,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    check_in_from: Optional[date] = Query(None, description="Fecha de entrada desde (incluida)"),
+    check_in_to: Optional[date] = Query(None, description="Fecha de entrada hasta (no incluida)"),
+):
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_reservations(read_engine_for(request), export_format, check_in_from, check_in_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reservations.{export_format}"'},
+    )
+
+# GET grilla de ocupación habitaciones x noches para el calendario de recepción
+@router.get("/api/reservations/grid", response_model=OccupancyGrid, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def reservations_grid(
+    session: ReadSessionDep,
+    start: date = Query(..., description="Primera noche de la grilla"),
+    days: int = Query(30, ge=1, le=366, description="Cantidad de noches"),
+    encoding: str = Query("bitset", pattern="^(bitset|rle)$", description="bitset: base64 de un bit por noche; rle: largos de tramos libres/ocupados"),
+    room_type_id: Optional[int] = Query(None),
+):
+    try:
+        # numpy se carga al usar la grilla por primera vez, igual que reportlab en el dashboard
+        from core.occupancy import encode_bitset, encode_rle, occupancy_grid
+
+        end = start + timedelta(days=days)
+        room_query = select(Room.id, Room.room_number).where(Room.active == True).order_by(Room.id)
+        if room_type_id is not None:
+            room_query = room_query.where(Room.room_type_id == room_type_id)
+        rooms = (await session.exec(room_query)).all()
+
+        # una sola consulta con los intervalos que tocan la ventana
+        intervals = (await session.exec(
+            select(Reservation.room_id, Reservation.check_in_date, Reservation.check_out_date).where(
+                Reservation.room_id.in_([room_id for room_id, _ in rooms]),
+                Reservation.check_in_date < end,
+                Reservation.check_out_date > start,
+                Reservation.reservation_status_id.not_in(cancelled_status_ids()),
+            )
+        )).all()
+
+        grid = occupancy_grid([room_id for room_id, _ in rooms], intervals, start, days)
+        encode = encode_bitset if encoding == "bitset" else encode_rle
+        return OccupancyGrid(
+            start=start,
+            days=days,
+            encoding=encoding,
+            rooms=[
+                RoomOccupancy(room_id=room_id, room_number=room_number, nights=encode(grid[index]))
+                for index, (room_id, room_number) in enumerate(rooms)
+            ],
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building occupancy grid: {str(e)}"
+        )
+
+# POST para cotizar muchas combinaciones (habitación, fechas) sin reservar
+@router.post("/api/reservations/quote", response_model=ReservationQuoteResult, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def quote_reservations(quote_request: ReservationQuoteRequest, session: AsyncSessionDep):
+    try:
+        stays = [(item.room_id, item.check_in_date, item.check_out_date) for item in quote_request.items]
+        quotes = [
+            ReservationQuote(
+                room_id=room_id, check_in_date=check_in, check_out_date=check_out,
+                nights=nights, price_per_night=price, total=total, detail=detail,
+            )
+            for (room_id, check_in, check_out), (nights, price, total, detail) in zip(stays, await quote_stays(session, stays))
+        ]
+        return ReservationQuoteResult(quotes=quotes)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error quoting reservations: {str(e)}"
+        )
+
 # GET para obtener una reserva por su ID
-@router.get("/api/reservations/{reservation_id}", response_model=ReservationRead, status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
-def read_reservation(reservation_id: int, session: SessionDep):
+@router.get("/api/reservations/{reservation_id}", response_model=ReservationReadExpanded, response_model_exclude_unset=True, status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def read_reservation(
+    reservation_id: int,
+    session: AsyncSessionDep,
+    expand: Optional[str] = Query(None, description="Relaciones a incluir: client,room,status,user"),
+):
     try:
-        db_reservation = session.get(Reservation, reservation_id)
+        names = parse_expand(expand)
+        db_reservation = await session.get(Reservation, reservation_id, options=expand_options(names))
         if db_reservation is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
-        return db_reservation
+        return to_expanded(db_reservation, names)
+    except HTTPException as http_exc:
+        raise http_exc
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid input data: {str(ve)}"
@@ -97,13 +334,46 @@ def read_reservation(reservation_id: int, session: SessionDep):
         )
 
 # GET para obtener todas las reservas con paginación
-@router.get("/api/reservations/", response_model=List[ReservationRead], status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
-def read_all_reservations(session: SessionDep):
+@router.get("/api/reservations/", response_model=List[ReservationReadExpanded], response_model_exclude_unset=True, status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
+async def read_all_reservations(
+    session: ReadSessionDep,
+    response: Response,
+    #paginacion por cursor (keyset): el costo no depende de la profundidad de la página
+    cursor: Optional[int] = Query(None, ge=1, description="Valor de X-Next-Cursor de la página anterior"),
+    limit: int = Query(20, ge=1, le=100, description="Cantidad de items por página"),
+    #filtros
+    client_id: Optional[int] = Query(None),
+    room_id: Optional[int] = Query(None),
+    reservation_status_id: Optional[int] = Query(None),
+    check_in_from: Optional[date] = Query(None, description="Fecha de entrada desde (incluida)"),
+    check_in_to: Optional[date] = Query(None, description="Fecha de entrada hasta (no incluida)"),
+    expand: Optional[str] = Query(None, description="Relaciones a incluir: client,room,status,user"),
+):
     try:
+        names = parse_expand(expand)
         # Sort by ID in descending order
-        query = select(Reservation).order_by(desc(Reservation.id))
-        reservations = session.exec(query).all()
-        return reservations
+        query = select(Reservation).options(*expand_options(names)).order_by(desc(Reservation.id))
+        if cursor is not None:
+            query = query.where(Reservation.id < cursor)
+        if client_id is not None:
+            query = query.where(Reservation.client_id == client_id)
+        if room_id is not None:
+            query = query.where(Reservation.room_id == room_id)
+        if reservation_status_id is not None:
+            query = query.where(Reservation.reservation_status_id == reservation_status_id)
+        if check_in_from is not None:
+            query = query.where(Reservation.check_in_date >= check_in_from)
+        if check_in_to is not None:
+            query = query.where(Reservation.check_in_date < check_in_to)
+
+        # se pide una fila extra para saber si hay otra página
+        reservations = (await session.exec(query.limit(limit + 1))).all()
+        if len(reservations) > limit:
+            reservations = reservations[:limit]
+            response.headers["X-Next-Cursor"] = str(reservations[-1].id)
+        return [to_expanded(reservation, names) for reservation in reservations]
+    except HTTPException as http_exc:
+        raise http_exc
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid input data: {str(ve)}"
@@ -116,22 +386,44 @@ def read_all_reservations(session: SessionDep):
 
 # PATCH para actualizar una reserva
 @router.patch("/api/reservations/{reservation_id}", response_model=ReservationRead, status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
-def update_reservation(reservation_id: int, reservation_update: ReservationUpdate,session: SessionDep):
+async def update_reservation(reservation_id: int, reservation_update: ReservationUpdate,session: AsyncSessionDep):
     try:
-        db_reservation = session.get(Reservation, reservation_id)
+        db_reservation = await session.get(Reservation, reservation_id)
         if db_reservation is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
 
         reservation_data = reservation_update.model_dump(exclude_unset=True)
+        # bloquea la habitación destino (y la anterior, que puede liberar noches) antes de modificar la reserva
+        room_id = reservation_data.get("room_id") or db_reservation.room_id
+        room = (await lock_rooms(session, [room_id, db_reservation.room_id])).get(room_id)
+        if not room:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Room not found")
+        previous_stay = (db_reservation.room_id, db_reservation.check_in_date, db_reservation.check_out_date)
+        was_occupying = not await is_cancelled_status(session, db_reservation.reservation_status_id)
         for key, value in reservation_data.items():
             setattr(db_reservation, key, value)
 
-        db_reservation.total = calculate_total_reservation(session, db_reservation)
-        print (db_reservation.total)
+        # las noches solo cambian si cambia la estancia o si la reserva pasa a ocupar o a liberar la habitación;
+        # así un cambio de estado o de nota no se comprueba contra solapes antiguos que la migración conservó
+        stay_changed = (db_reservation.room_id, db_reservation.check_in_date, db_reservation.check_out_date) != previous_stay
+        occupies_room = not await is_cancelled_status(session, db_reservation.reservation_status_id)
+        if stay_changed or occupies_room != was_occupying:
+            await release_room_nights(session, db_reservation)
+            occupies_room = await ensure_room_available(
+                session, room, db_reservation.check_in_date, db_reservation.check_out_date,
+                db_reservation.reservation_status_id, exclude_reservation_id=db_reservation.id,
+            )
+            if occupies_room:
+                await insert_room_nights(session, [db_reservation])
+        db_reservation.total = calculate_total_reservation(room.price_per_night, db_reservation.check_in_date, db_reservation.check_out_date)
         session.add(db_reservation)
-        session.commit()
-        session.refresh(db_reservation)
+        await session.commit()
+        # el dashboard agrupa por mes de entrada: se invalidan el mes anterior y el nuevo
+        invalidate_dashboard(previous_stay[1], db_reservation.check_in_date)
+        await session.refresh(db_reservation)
         return db_reservation
+    except HTTPException as http_exc:
+        raise http_exc
     except ValidationError as ve:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -149,14 +441,20 @@ def update_reservation(reservation_id: int, reservation_update: ReservationUpdat
 
 # DELETE para eliminar una reserva
 @router.delete("/api/reservations/{reservation_id}", status_code=status.HTTP_200_OK, tags=["RESERVATION"],dependencies=[(Depends(decode_token))])
-def delete_reservation(reservation_id: int, session: SessionDep):
+async def delete_reservation(reservation_id: int, session: AsyncSessionDep):
     try:
-        db_reservation = session.get(Reservation, reservation_id)
+        db_reservation = await session.get(Reservation, reservation_id)
         if db_reservation is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reservation not found")
-        session.delete(db_reservation)
-        session.commit()
+        await lock_rooms(session, [db_reservation.room_id])
+        await release_room_nights(session, db_reservation)
+        check_in_date = db_reservation.check_in_date
+        await session.delete(db_reservation)
+        await session.commit()
+        invalidate_dashboard(check_in_date)
         return  # No se devuelve contenido con HTTP 204
+    except HTTPException as http_exc:
+        raise http_exc
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid input data: {str(ve)}"
@@ -1,11 +1,15 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 from fastapi import APIRouter, Depends, Query, status, HTTPException
 from pydantic import ValidationError
 from sqlmodel import select
 
+from core.availability import available_rooms_query
+from core.dashboard import invalidate_room_count
+from core.pricing import ensure_valid_stay, invalidate_room_prices
 from core.security import decode_token
 from models.room import Room, RoomCreate, RoomStatusUpdate, RoomUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep, ReadSessionDep
 from models.room_status import RoomStatus
 
 router = APIRouter()
@@ -13,15 +17,15 @@ router = APIRouter()
 
 #lista de tipos de room
 @router.get("/api/room", response_model=List[Room], tags=["ROOM"],dependencies=[(Depends(decode_token))])
-def list_room(
-    session: SessionDep,
+async def list_room(
+    session: ReadSessionDep,
     #paginacion
     page: int = Query(1, ge=1, description="Número de página a obtener"),
     limit: int = Query(20, ge=1, le=100, description="Cantidad de items por página"),
     ):
     try:
         offset = (page - 1) * limit
-        rooms = session.exec(select(Room).offset(offset).limit(limit)).all()
+        rooms = (await session.exec(select(Room).offset(offset).limit(limit))).all()
         return rooms
     except Exception as e:
         raise HTTPException(
@@ -30,12 +34,38 @@ def list_room(
         )
 
 
+# habitaciones libres entre dos fechas (declarada antes de /api/room/{room_id})
+@router.get("/api/room/availability", response_model=List[Room], tags=["ROOM"],dependencies=[(Depends(decode_token))])
+async def room_availability(
+    session: ReadSessionDep,
+    check_in: date = Query(..., description="Fecha de entrada"),
+    check_out: date = Query(..., description="Fecha de salida (no incluida)"),
+    capacity: Optional[int] = Query(None, ge=1, description="Capacidad mínima"),
+    room_type_id: Optional[int] = Query(None, description="Filtrar por tipo de habitación"),
+    #paginacion
+    page: int = Query(1, ge=1, description="Número de página a obtener"),
+    limit: int = Query(20, ge=1, le=100, description="Cantidad de items por página"),
+    ):
+    try:
+        ensure_valid_stay(check_in, check_out)
+        offset = (page - 1) * limit
+        query = available_rooms_query(check_in, check_out, capacity, room_type_id)
+        return (await session.exec(query.offset(offset).limit(limit))).all()
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while searching available rooms: {str(e)}",
+        )
+
+
 # obtener tipo de room por id para listar
 @router.get("/api/room/{room_id}", response_model=Room, tags=["ROOM"],dependencies=[(Depends(decode_token))])
-def read_room(room_id: int, session: SessionDep):
+async def read_room(room_id: int, session: AsyncSessionDep):
 
     try:
-        room_db = session.get(Room, room_id)
+        room_db = await session.get(Room, room_id)
         if not room_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room doesn't exits"
@@ -55,18 +85,19 @@ def read_room(room_id: int, session: SessionDep):
         )
 #crear tipo de room
 @router.post("/api/room", response_model=Room, status_code=status.HTTP_201_CREATED ,tags=["ROOM"],dependencies=[(Depends(decode_token))])
-def create_room(room_data: RoomCreate,session: SessionDep):
+async def create_room(room_data: RoomCreate,session: AsyncSessionDep):
 
     try:
         room = Room.model_validate(room_data.model_dump())
-        existing_room=session.exec(select(Room).where(Room.room_number == room.room_number)).first()
+        existing_room=(await session.exec(select(Room).where(Room.room_number == room.room_number))).first()
         if existing_room:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,detail="Room already registered"
             )
         session.add(room)#insertamos datos
-        session.commit()#conectamos la bd
-        session.refresh(room)#refrescamos despues de insertar datos
+        await session.commit()#conectamos la bd
+        invalidate_room_count()
+        await session.refresh(room)#refrescamos despues de insertar datos
         return room
     except HTTPException as http_exc:
     # Re-raise HTTPExceptions to avoid them being caught by the general Exception handler
@@ -84,9 +115,9 @@ def create_room(room_data: RoomCreate,session: SessionDep):
 
 #actualizar estado de habitacion
 @router.patch("/api/room/{room_id}/status", response_model=dict, status_code=status.HTTP_200_OK, tags=["ROOM"],dependencies=[(Depends(decode_token))])
-def update_room_status(room_id: int, status_update: RoomStatusUpdate, session: SessionDep):
+async def update_room_status(room_id: int, status_update: RoomStatusUpdate, session: AsyncSessionDep):
     try:
-        room_db = session.get(Room, room_id)
+        room_db = await session.get(Room, room_id)
         if not room_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room doesn't exist"
@@ -100,8 +131,8 @@ def update_room_status(room_id: int, status_update: RoomStatusUpdate, session: S
 
         room_db.active = status_update.active       
         session.add(room_db)
-        session.commit()
-        session.refresh(room_db)
+        await session.commit()
+        await session.refresh(room_db)
 
         return {"message": f"Room: '{room_db.room_number}' has successfully updated their status to: {room_db.active}"}
     except HTTPException as http_exc:
@@ -115,25 +146,26 @@ def update_room_status(room_id: int, status_update: RoomStatusUpdate, session: S
 
 # obtener tipo de room por id para actualizar
 @router.patch("/api/room/{room_id}", response_model=Room, status_code=status.HTTP_200_OK, tags=["ROOM"],dependencies=[(Depends(decode_token))])
-def update_room( room_id: int, room_data: RoomUpdate, session: SessionDep):
+async def update_room( room_id: int, room_data: RoomUpdate, session: AsyncSessionDep):
 
     try:
-        room_db = session.get(Room, room_id)
+        room_db = await session.get(Room, room_id)
         if not room_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room doesn't exits"
             )#status.http y el codigo y detail es para el mensaje que retorna
         room_data_dict=room_data.model_dump(exclude_unset=True)
         if "room_number" in room_data_dict and room_data_dict["room_number"] != room_db.room_number:
-                existing_room = session.exec(select(Room).where(Room.room_number == room_data_dict["room_number"])).first()
+                existing_room = (await session.exec(select(Room).where(Room.room_number == room_data_dict["room_number"]))).first()
                 if existing_room and existing_room.id != room_id:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST, detail="Room already registered"
                     )
         room_db.sqlmodel_update(room_data_dict)
         session.add(room_db)
-        session.commit()
-        session.refresh(room_db)
+        await session.commit()
+        invalidate_room_prices()
+        await session.refresh(room_db)
         return room_db
     except HTTPException as http_exc:
     # Re-raise HTTPExceptions to avoid them being caught by the general Exception handler
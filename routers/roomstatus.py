@@ -4,16 +4,16 @@ from sqlmodel import select, Session
 
 from core.security import decode_token
 from models.room_status import RoomStatus, RoomStatusCreate, RoomStatusUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep
 
 router = APIRouter()
 
 
 # lista de tipos de habitacion
 @router.get("/api/roomstatus", response_model=list[RoomStatus], tags=["ROOM STATUS"],dependencies=[(Depends(decode_token))])
-def list_roomstatus(session: SessionDep):
+async def list_roomstatus(session: AsyncSessionDep):
     try:
-        return session.exec(select(RoomStatus)).all()  # esto ejecuta transacciones de sql
+        return (await session.exec(select(RoomStatus))).all()  # esto ejecuta transacciones de sql
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -23,9 +23,9 @@ def list_roomstatus(session: SessionDep):
 
 # obtener tipo de habitacion por id para listar
 @router.get("/api/roomstatus/{roomstatus_id}", response_model=RoomStatus, tags=["ROOM STATUS"],dependencies=[(Depends(decode_token))])
-def read_roomstatus(roomstatus_id: int, session: SessionDep):
+async def read_roomstatus(roomstatus_id: int, session: AsyncSessionDep):
     try:
-        roomstatus_db = session.get(RoomStatus, roomstatus_id)
+        roomstatus_db = await session.get(RoomStatus, roomstatus_id)
         if not roomstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room status not found"
@@ -41,18 +41,18 @@ def read_roomstatus(roomstatus_id: int, session: SessionDep):
 
 # crear tipo de habitacion
 @router.post("/api/roomstatus", response_model=RoomStatus, status_code=status.HTTP_201_CREATED, tags=["ROOM STATUS"],dependencies=[(Depends(decode_token))])
-def create_roomstatus(room_status_data: RoomStatusCreate, session: SessionDep):
+async def create_roomstatus(room_status_data: RoomStatusCreate, session: AsyncSessionDep):
     try:
         # roomstatus = RoomStatus.model_validate(room_status_data.model_dump())  # No es necesario con SQLModel
         roomstatus = RoomStatus(name=room_status_data.name, description=room_status_data.description) #forma correcta de crear la instancia con SQLModel
-        existing_roomstatus = session.exec(select(RoomStatus).where(RoomStatus.name == roomstatus.name)).first()
+        existing_roomstatus = (await session.exec(select(RoomStatus).where(RoomStatus.name == roomstatus.name))).first()
         if existing_roomstatus:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Room status name already exists"
             )
         session.add(roomstatus)  # insertamos datos
-        session.commit()  # conectamos la bd
-        session.refresh(roomstatus)  # refrescamos despues de insertar datos
+        await session.commit()  # conectamos la bd
+        await session.refresh(roomstatus)  # refrescamos despues de insertar datos
         return roomstatus
     except ValidationError as ve:
         raise HTTPException(
@@ -73,15 +73,15 @@ def create_roomstatus(room_status_data: RoomStatusCreate, session: SessionDep):
 
 # obtener room_status por id para eliminar
 @router.delete("/api/roomstatus/{roomstatus_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["ROOM STATUS"],dependencies=[(Depends(decode_token))])
-def delete_roomstatus(roomstatus_id: int, session: SessionDep):
+async def delete_roomstatus(roomstatus_id: int, session: AsyncSessionDep):
     try:
-        roomstatus_db = session.get(RoomStatus, roomstatus_id)
+        roomstatus_db = await session.get(RoomStatus, roomstatus_id)
         if not roomstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room status not found"
             )
-        session.delete(roomstatus_db)
-        session.commit()
+        await session.delete(roomstatus_db)
+        await session.commit()
         return {"detail": "Room status deleted successfully"}  
     except Exception as e:
         raise HTTPException(
@@ -93,9 +93,9 @@ def delete_roomstatus(roomstatus_id: int, session: SessionDep):
 
 # obtener tipo de habitacion por id para actualizar
 @router.patch("/api/roomstatus/{roomstatus_id}", response_model=RoomStatus, tags=["ROOM STATUS"],dependencies=[(Depends(decode_token))])
-def update_roomstatus(roomstatus_id: int, roomstatus_data: RoomStatusUpdate, session: SessionDep):
+async def update_roomstatus(roomstatus_id: int, roomstatus_data: RoomStatusUpdate, session: AsyncSessionDep):
     try:
-        roomstatus_db = session.get(RoomStatus, roomstatus_id)
+        roomstatus_db = await session.get(RoomStatus, roomstatus_id)
         if not roomstatus_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room status not found"
@@ -103,15 +103,15 @@ def update_roomstatus(roomstatus_id: int, roomstatus_data: RoomStatusUpdate, ses
 
         roomstatus_data_dict = roomstatus_data.model_dump(exclude_unset=True)  # esto evita que se envien datos vacios a la base de datos
         if "name" in roomstatus_data_dict and roomstatus_data_dict["name"] != roomstatus_db.name:
-            existing_roomstatus = session.exec(select(RoomStatus).where(RoomStatus.name == roomstatus_data_dict["name"])).first()
+            existing_roomstatus = (await session.exec(select(RoomStatus).where(RoomStatus.name == roomstatus_data_dict["name"]))).first()
             if existing_roomstatus and existing_roomstatus.id != roomstatus_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Room status name already exists"
                 )
         roomstatus_db.sqlmodel_update(roomstatus_data_dict)
         session.add(roomstatus_db)
-        session.commit()
-        session.refresh(roomstatus_db)
+        await session.commit()
+        await session.refresh(roomstatus_db)
         return roomstatus_db
     except ValidationError as ve:
         raise HTTPException(
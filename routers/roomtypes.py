@@ -4,23 +4,23 @@ from sqlmodel import select
 
 from core.security import decode_token
 from models.room_type import RoomType, RoomTypeCreate, RoomTypeUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep
 
 router = APIRouter()
 
 
 #lista de tipos de habitacion
 @router.get("/api/roomtypes", response_model=list[RoomType], tags=["ROOM TYPES"],dependencies=[(Depends(decode_token))])
-def list_roomtype(session: SessionDep):
-    return session.exec(select(RoomType)).all()#esto ejecuta transacciones de sql
+async def list_roomtype(session: AsyncSessionDep):
+    return (await session.exec(select(RoomType))).all()#esto ejecuta transacciones de sql
 
 
 # obtener tipo de habitacion por id para listar
 @router.get("/api/roomtypes/{roomtype_id}", response_model=RoomType, tags=["ROOM TYPES"],dependencies=[(Depends(decode_token))])
-def read_roomtype(roomtype_id: int, session: SessionDep):
+async def read_roomtype(roomtype_id: int, session: AsyncSessionDep):
 
     try:
-        roomtype_db = session.get(RoomType, roomtype_id)
+        roomtype_db = await session.get(RoomType, roomtype_id)
         if not roomtype_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room type doesn't exits"
@@ -34,18 +34,18 @@ def read_roomtype(roomtype_id: int, session: SessionDep):
 
 #crear tipo de habitacion
 @router.post("/api/roomtypes", response_model=RoomType,status_code=status.HTTP_201_CREATED,tags=["ROOM TYPES"],dependencies=[(Depends(decode_token))])
-def create_roomtype(room_types_data: RoomTypeCreate,session: SessionDep):
+async def create_roomtype(room_types_data: RoomTypeCreate,session: AsyncSessionDep):
     try:
         #validate
         roomtype = RoomType.model_validate(room_types_data.model_dump())
-        existing_user_type=session.exec(select(RoomType).where(RoomType.name == roomtype.name)).first()
+        existing_user_type=(await session.exec(select(RoomType).where(RoomType.name == roomtype.name))).first()
         if existing_user_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="User Type already registered" 
             )
         session.add(roomtype)#insertamos datos
-        session.commit()#conectamos la bd
-        session.refresh(roomtype)#refrescamos despues de insertar datos
+        await session.commit()#conectamos la bd
+        await session.refresh(roomtype)#refrescamos despues de insertar datos
         return roomtype
 
     except HTTPException as http_exc:
@@ -67,16 +67,16 @@ def create_roomtype(room_types_data: RoomTypeCreate,session: SessionDep):
 
 # obtener room_types por id para eliminar
 @router.delete("/api/roomtypes/{roomtype_id}",status_code=status.HTTP_200_OK, tags=["ROOM TYPES"],dependencies=[(Depends(decode_token))])
-def delete_roomtype(roomtype_id: int, session: SessionDep):
+async def delete_roomtype(roomtype_id: int, session: AsyncSessionDep):
     
     try:
-        roomtype_db = session.get(RoomType, roomtype_id)
+        roomtype_db = await session.get(RoomType, roomtype_id)
         if not roomtype_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Room type doesn't exits"
             )
-        session.delete(roomtype_db)
-        session.commit()
+        await session.delete(roomtype_db)
+        await session.commit()
         return {"detail": "ok"}
     except Exception as e:
         raise HTTPException(
@@ -86,10 +86,10 @@ def delete_roomtype(roomtype_id: int, session: SessionDep):
 
 # obtener tipo de habitacion por id para actualizar
 @router.patch("/api/roomtypes/{roomtype_id}", response_model=RoomType, tags=["ROOM TYPES"],dependencies=[(Depends(decode_token))])
-def update_roomtype( roomtype_id: int, roomtype_data: RoomTypeUpdate, session: SessionDep):
+async def update_roomtype( roomtype_id: int, roomtype_data: RoomTypeUpdate, session: AsyncSessionDep):
 
     try:
-            roomtype_db = session.get(RoomType, roomtype_id)
+            roomtype_db = await session.get(RoomType, roomtype_id)
         
             #validate
             if not roomtype_db:
@@ -99,7 +99,7 @@ def update_roomtype( roomtype_id: int, roomtype_data: RoomTypeUpdate, session: S
             roomtype_data_dict=roomtype_data.model_dump(exclude_unset=True)
             #validador
             if "name" in roomtype_data_dict and roomtype_data_dict["name"] != roomtype_db.name:
-                existing_usertype = session.exec(select(RoomType).where(RoomType.name == roomtype_data_dict["name"])).first()
+                existing_usertype = (await session.exec(select(RoomType).where(RoomType.name == roomtype_data_dict["name"]))).first()
                 if existing_usertype and existing_usertype.id != roomtype_id:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST, detail="User already registered"
@@ -107,8 +107,8 @@ def update_roomtype( roomtype_id: int, roomtype_data: RoomTypeUpdate, session: S
             usertype_data_dict=roomtype_data.model_dump(exclude_unset=True)# esto evita que se envien datos vacios a la base de datos
             roomtype_db.sqlmodel_update(usertype_data_dict)
             session.add(roomtype_db)
-            session.commit()
-            session.refresh(roomtype_db)
+            await session.commit()
+            await session.refresh(roomtype_db)
             return roomtype_db
 
     except HTTPException as http_exc:
@@ -2,18 +2,18 @@ from fastapi import APIRouter, Depends, status, HTTPException
 from pydantic import ValidationError
 from sqlmodel import select
 
-from core.security import decode_token, hash_password, verify_password
+from core.security import decode_token, hash_password_async, invalidate_user_tokens, revoke_user_tokens, verify_password_async
 from models.user import PasswordUpdate, User, UserCreate, UserUpdate, UserBase, UserStatus
-from core.database import SessionDep
+from core.database import AsyncSessionDep
 
 router = APIRouter()
 
 
 #lista de tipos de usuario
 @router.get("/api/user", response_model=list[User], tags=["USER"],dependencies=[(Depends(decode_token))])
-def list_user(session: SessionDep):
+async def list_user(session: AsyncSessionDep):
     try:
-        return session.exec(select(User)).all()#esto ejecuta transacciones de sql
+        return (await session.exec(select(User))).all()#esto ejecuta transacciones de sql
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -23,9 +23,9 @@ def list_user(session: SessionDep):
 
 # obtener tipo de usuario por id para listar
 @router.get("/api/user/{user_id}", response_model=User, tags=["USER"],dependencies=[(Depends(decode_token))])
-def read_user(user_id: int, session: SessionDep):
+async def read_user(user_id: int, session: AsyncSessionDep):
     try:
-        user_db = session.get(User, user_id)
+        user_db = await session.get(User, user_id)
         if not user_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exits"
@@ -39,7 +39,7 @@ def read_user(user_id: int, session: SessionDep):
 
 #crear  usuario
 @router.post("/api/user", response_model=User, status_code=status.HTTP_201_CREATED ,tags=["USER"],dependencies=[(Depends(decode_token))])
-def create_user(user_data: UserCreate,session: SessionDep):
+async def create_user(user_data: UserCreate,session: AsyncSessionDep):
 
     try:
         #validador de longitud de contraseña
@@ -49,7 +49,7 @@ def create_user(user_data: UserCreate,session: SessionDep):
             )
         
         # Validar y hashear la contraseña
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         
         user_data_dict = user_data.model_dump()
         user_data_dict["password"] = hashed_password
@@ -58,21 +58,21 @@ def create_user(user_data: UserCreate,session: SessionDep):
         user = User.model_validate(user_data_dict) 
 
         # Validaciones de existencia de username y email
-        existing_user = session.exec(select(User).where(User.username == user.username)).first()
+        existing_user = (await session.exec(select(User).where(User.username == user.username))).first()
         if existing_user:
             raise HTTPException(
                status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered" 
             )
         
-        existing_email = session.exec(select(User).where(User.email == user.email)).first()
+        existing_email = (await session.exec(select(User).where(User.email == user.email))).first()
         if existing_email:
             raise HTTPException(
                status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered" 
             )
         
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
         return user
 
     except HTTPException as http_exc:
@@ -91,10 +91,10 @@ def create_user(user_data: UserCreate,session: SessionDep):
 
 # obtener tipo de usuario por id para actualizar
 @router.patch("/api/user/{user_id}", response_model=User, status_code=status.HTTP_200_OK, tags=["USER"],dependencies=[(Depends(decode_token))])
-def update_user( user_id: int, user_data: UserUpdate, session: SessionDep):
+async def update_user( user_id: int, user_data: UserUpdate, session: AsyncSessionDep):
 
     try:
-        user_db = session.get(User, user_id)
+        user_db = await session.get(User, user_id)
 
         if not user_db:
             raise HTTPException(
@@ -104,7 +104,7 @@ def update_user( user_id: int, user_data: UserUpdate, session: SessionDep):
 
         #validador de username
         if "username" in user_data_dict and user_data_dict["username"] != user_db.username:
-            existing_user = session.exec(select(User).where(User.username == user_data_dict["username"])).first() # Cambiado de email a username
+            existing_user = (await session.exec(select(User).where(User.username == user_data_dict["username"]))).first() # Cambiado de email a username
             if existing_user and existing_user.id != user_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="User already registered"
@@ -112,12 +112,15 @@ def update_user( user_id: int, user_data: UserUpdate, session: SessionDep):
             
         #validador de email
         if "email" in user_data_dict and user_data_dict["email"] != user_db.email:
-            existing_email = session.exec(select(User).where(User.email == user_data_dict["email"])).first()
+            existing_email = (await session.exec(select(User).where(User.email == user_data_dict["email"]))).first()
             if existing_email and existing_email.id != user_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
                 )
         
+        # Solo un cambio de contraseña o de estado revoca las sesiones abiertas
+        revoke_tokens = "active" in user_data_dict and user_data_dict["active"] != user_db.active
+
         # Hashear la nueva contraseña si se proporciona
         if "password" in user_data_dict and user_data_dict["password"] is not None:
             # Validar longitud de la contraseña antes de hashear
@@ -125,13 +128,22 @@ def update_user( user_id: int, user_data: UserUpdate, session: SessionDep):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="The password must be at least 6 characters."
                 )
-            user_data_dict["password"] = hash_password(user_data_dict["password"])
+            if await verify_password_async(user_data_dict["password"], user_db.password):
+                del user_data_dict["password"] # es la misma: se conserva el hash actual
+            else:
+                user_data_dict["password"] = await hash_password_async(user_data_dict["password"])
+                revoke_tokens = True
 
         user_db.sqlmodel_update(user_data_dict)
         session.add(user_db)
-        session.commit()
-        session.refresh(user_db)
+        if revoke_tokens:
+            await revoke_user_tokens(session, user_id)
+        await session.commit()
+        await session.refresh(user_db)
+        invalidate_user_tokens(user_id)
         return user_db    
+    except HTTPException as http_exc:
+        raise http_exc
     except ValueError as ve:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid input data: {str(ve)}"
@@ -145,9 +157,9 @@ def update_user( user_id: int, user_data: UserUpdate, session: SessionDep):
 
 #actualizar estado de usuario
 @router.patch("/api/user/{user_id}/status", response_model=dict, status_code=status.HTTP_200_OK, tags=["USER"],dependencies=[(Depends(decode_token))])
-def update_user_status(user_id: int, status_update: UserStatus, session: SessionDep):
+async def update_user_status(user_id: int, status_update: UserStatus, session: AsyncSessionDep):
     try:
-        user_db = session.get(User, user_id)
+        user_db = await session.get(User, user_id)
         if not user_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exist"
@@ -161,8 +173,10 @@ def update_user_status(user_id: int, status_update: UserStatus, session: Session
 
         user_db.active = status_update.active      
         session.add(user_db)
-        session.commit()
-        session.refresh(user_db)
+        await revoke_user_tokens(session, user_id)
+        await session.commit()
+        await session.refresh(user_db)
+        invalidate_user_tokens(user_id)
 
         return {"message": f"User '{user_db.username}' has successfully updated their status to: {user_db.active}"}
     except HTTPException as http_exc:
@@ -176,9 +190,9 @@ def update_user_status(user_id: int, status_update: UserStatus, session: Session
 #actualizar la contraseña
 
 @router.patch("/api/user/{user_id}/password", response_model=dict, status_code=status.HTTP_200_OK, tags=["USER"],dependencies=[(Depends(decode_token))])
-def update_user_password(user_id: int, password_update: PasswordUpdate, session: SessionDep):
+async def update_user_password(user_id: int, password_update: PasswordUpdate, session: AsyncSessionDep):
     try:
-        user_db = session.get(User, user_id)
+        user_db = await session.get(User, user_id)
         if not user_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User doesn't exist"
@@ -191,14 +205,16 @@ def update_user_password(user_id: int, password_update: PasswordUpdate, session:
             )
 
         # Verificar si la nueva contraseña es igual a la actual (hasheada)
-        if verify_password(password_update.password, user_db.password):
+        if await verify_password_async(password_update.password, user_db.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="New password cannot be the same as the old password."
             )
 
-        user_db.password = hash_password(password_update.password) # Hashear la nueva contraseña
+        user_db.password = await hash_password_async(password_update.password) # Hashear la nueva contraseña
         session.add(user_db)
-        session.commit()
+        await revoke_user_tokens(session, user_id)
+        await session.commit()
+        invalidate_user_tokens(user_id)
         return {"message": f"User '{user_db.username}' has successfully updated their password"}
     except HTTPException as http_exc:
         raise http_exc
@@ -4,16 +4,16 @@ from sqlmodel import select
 
 from core.security import decode_token
 from models.user_type import UserType, UserTypeCreate, UserTypeUpdate
-from core.database import SessionDep
+from core.database import AsyncSessionDep
 
 router = APIRouter()
 
 
 #lista de tipos de usuario
 @router.get("/api/usertypes", response_model=list[UserType], tags=["USER TYPES"],dependencies=[(Depends(decode_token))])
-def list_usertype(session: SessionDep):
+async def list_usertype(session: AsyncSessionDep):
     try:
-        return session.exec(select(UserType)).all()#esto ejecuta transacciones de sql
+        return (await session.exec(select(UserType))).all()#esto ejecuta transacciones de sql
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -23,9 +23,9 @@ def list_usertype(session: SessionDep):
 
 # obtener tipo de usuario por id para listar
 @router.get("/api/usertypes/{usertype_id}", response_model=UserType, tags=["USER TYPES"],dependencies=[(Depends(decode_token))])
-def read_usertype(usertype_id: int, session: SessionDep):
+async def read_usertype(usertype_id: int, session: AsyncSessionDep):
     try:   
-        usertype_db = session.get(UserType, usertype_id)
+        usertype_db = await session.get(UserType, usertype_id)
         if not usertype_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User Type doesn't exits"
@@ -42,19 +42,19 @@ def read_usertype(usertype_id: int, session: SessionDep):
 
 #crear tipo de usuario
 @router.post("/api/usertypes", response_model=UserType, status_code=status.HTTP_201_CREATED ,tags=["USER TYPES"],dependencies=[(Depends(decode_token))])
-def create_user(user_type_data: UserTypeCreate,session: SessionDep):
+async def create_user(user_type_data: UserTypeCreate,session: AsyncSessionDep):
 
     try:
         #validate
         usertype = UserType.model_validate(user_type_data.model_dump())
-        existing_user_type=session.exec(select(UserType).where(UserType.name == usertype.name)).first()
+        existing_user_type=(await session.exec(select(UserType).where(UserType.name == usertype.name))).first()
         if existing_user_type:
             raise HTTPException(
                status_code=status.HTTP_400_BAD_REQUEST, detail="User Type already registered" 
             )
         session.add(usertype)#insertamos datos
-        session.commit()#conectamos la bd
-        session.refresh(usertype)#refrescamos despues de insertar datos
+        await session.commit()#conectamos la bd
+        await session.refresh(usertype)#refrescamos despues de insertar datos
         return usertype
 
     except HTTPException as http_exc:
@@ -74,16 +74,16 @@ def create_user(user_type_data: UserTypeCreate,session: SessionDep):
 
 # obtener user_types por id para eliminar
 @router.delete("/api/usertypes/{usertype_id}",status_code=status.HTTP_200_OK, tags=["USER TYPES"],dependencies=[(Depends(decode_token))])
-def delete_usertype(usertype_id: int, session: SessionDep):
+async def delete_usertype(usertype_id: int, session: AsyncSessionDep):
 
     try:
-        usertype_db = session.get(UserType, usertype_id)
+        usertype_db = await session.get(UserType, usertype_id)
         if not usertype_db:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="UserType doesn´t exist"
             )
-        session.delete(usertype_db)
-        session.commit()
+        await session.delete(usertype_db)
+        await session.commit()
         return {"detail": "user type deleted succesfully"}
     except Exception as e:
         raise HTTPException(
@@ -94,10 +94,10 @@ def delete_usertype(usertype_id: int, session: SessionDep):
 
 # obtener tipo de usuario por id para actualizar
 @router.patch("/api/usertypes/{usertype_id}", response_model=UserType, tags=["USER TYPES"],dependencies=[(Depends(decode_token))])
-def update_usertype( usertype_id: int, usertype_data: UserTypeUpdate, session: SessionDep):
+async def update_usertype( usertype_id: int, usertype_data: UserTypeUpdate, session: AsyncSessionDep):
 
     try:
-        usertype_db = session.get(UserType, usertype_id)
+        usertype_db = await session.get(UserType, usertype_id)
         #validate
         if not usertype_db:
             raise HTTPException(
@@ -106,15 +106,15 @@ def update_usertype( usertype_id: int, usertype_data: UserTypeUpdate, session: S
         usertype_data_dict=usertype_data.model_dump(exclude_unset=True)
         #validador
         if "name" in usertype_data_dict and usertype_data_dict["name"] != usertype_db.name:
-            existing_usertype = session.exec(select(UserType).where(UserType.name == usertype_data_dict["username"])).first()
+            existing_usertype = (await session.exec(select(UserType).where(UserType.name == usertype_data_dict["username"]))).first()
             if existing_usertype and existing_usertype.id != usertype_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST, detail="User already registered"
                 )
         usertype_db.sqlmodel_update(usertype_data_dict)
         session.add(usertype_db)
-        session.commit()
-        session.refresh(usertype_db)
+        await session.commit()
+        await session.refresh(usertype_db)
         return usertype_db
 
     except HTTPException as http_exc:
@@ -0,0 +1,146 @@
+"""Compara el dashboard anterior (cinco consultas con extract(month/year)) con la consulta agregada actual.
+
+Usa la base de DATABASE_URL del .env (MySQL: el promedio de noches usa datediff). Con --seed inserta
+reservas sintéticas repartidas en varios años sobre las habitaciones, clientes y estados existentes;
+hágalo solo en una base de pruebas.
+
+    python scripts/bench_dashboard.py --seed 1000000
+    python scripts/bench_dashboard.py --month 3 --year 2024 --runs 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(rows: int, years: int, batch_size: int = 10000):
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+
+    from core.database import engine, load_models
+    from models.client import Client
+    from models.reservation import Reservation
+    from models.reservation_status import ReservationStatus
+    from models.room import Room
+    from models.user import User
+
+    load_models()
+    with Session(engine) as session:
+        room_ids = session.exec(select(Room.id)).all()
+        client_ids = session.exec(select(Client.id)).all()
+        status_ids = session.exec(select(ReservationStatus.id)).all()
+        user_id = session.exec(select(User.id)).first()
+        if not (room_ids and client_ids and status_ids and user_id):
+            raise SystemExit("seed needs at least one room, client, reservation status and user")
+
+        first_day = date(date.today().year - years + 1, 1, 1)
+        span = (date(date.today().year + 1, 1, 1) - first_day).days
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for _ in range(min(batch_size, rows - offset)):
+                check_in = first_day + timedelta(days=random.randrange(span))
+                nights = random.randint(1, 7)
+                batch.append({
+                    "user_id": user_id,
+                    "reservation_status_id": random.choice(status_ids),
+                    "client_id": random.choice(client_ids),
+                    "room_id": random.choice(room_ids),
+                    "check_in_date": check_in,
+                    "check_out_date": check_in + timedelta(days=nights),
+                    "note": "bench",
+                    "total": Decimal(random.randint(50, 300) * nights),
+                })
+            session.exec(insert(Reservation), params=batch)
+            session.commit()
+    print(f"seeded {rows} reservations")
+
+
+async def legacy_dashboard(session, month: int, year: int) -> dict:
+    # implementación previa: extract() sobre check_in_date impide usar el índice y son cinco viajes a la base
+    from sqlalchemy import extract, func
+    from sqlmodel import select
+
+    from models.reservation import Reservation
+    from models.room import Room
+
+    in_month = (extract("month", Reservation.check_in_date) == month, extract("year", Reservation.check_in_date) == year)
+    total_recaudo = (await session.exec(select(func.sum(Reservation.total)).where(*in_month))).first() or Decimal(0.00)
+    total_habitaciones = (await session.exec(select(func.count(Room.id)))).first() or 1
+    habitaciones_reservadas = (await session.exec(select(func.count(Reservation.id)).where(*in_month))).first() or 0
+    promedio_dias = (await session.exec(select(
+        func.avg(func.datediff(Reservation.check_out_date, Reservation.check_in_date))
+    ).where(*in_month))).first() or 0
+    total_clientes = (await session.exec(
+        select(func.count(func.distinct(Reservation.client_id))).where(*in_month)
+    )).first() or 0
+    return {
+        "total_recaudo": float(total_recaudo),
+        "porcentaje_ocupacion": round((habitaciones_reservadas / total_habitaciones) * 100, 2),
+        "promedio_dias": round(promedio_dias, 2),
+        "total_clientes": total_clientes
+    }
+
+
+async def measure(label: str, implementation, month: int, year: int, runs: int) -> dict:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from core.database import async_engine
+    from core.logging_config import RequestQueryStats, request_query_stats
+
+    timings, result, stats = [], None, RequestQueryStats()
+    for _ in range(runs):
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+        try:
+            async with AsyncSession(async_engine) as session:
+                started = time.perf_counter()
+                result = await implementation(session, month, year)
+                timings.append(time.perf_counter() - started)
+        finally:
+            request_query_stats.reset(token)
+    print(
+        f"{label:>10}: median {statistics.median(timings) * 1000:.1f} ms (min {min(timings) * 1000:.1f}) | "
+        f"{stats.count} queries per call"
+    )
+    return result
+
+
+async def run(month: int, year: int, runs: int):
+    from core.dashboard import dashboard_metrics
+    from core.database import async_engine, load_models
+
+    load_models()
+    try:
+        legacy = await measure("legacy", legacy_dashboard, month, year, runs)
+        current = await measure("aggregate", dashboard_metrics, month, year, runs)
+    finally:
+        await async_engine.dispose()
+    if legacy != current:
+        raise SystemExit(f"results differ: {legacy} != {current}")
+    print(f"results match: {current}")
+
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="reservas sintéticas a insertar antes de medir")
+    parser.add_argument("--years", type=int, default=5, help="años por los que se reparten las reservas sembradas")
+    parser.add_argument("--month", type=int, default=today.month)
+    parser.add_argument("--year", type=int, default=today.year)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.seed, args.years)
+    asyncio.run(run(args.month, args.year, args.runs))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Mide el tiempo de arranque de la API: importación de app.main y tiempo hasta responder en "/".
+
+Uso (desde la raíz del proyecto, con el .env configurado):
+
+    python scripts/bench_startup.py --runs 5
+
+Compara el arranque con create_all (DB_CREATE_TABLES_ON_STARTUP=true) y sin él.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(env: dict) -> float:
+    # proceso nuevo en cada corrida para medir la importación en frío
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_ready(env: dict, timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError("uvicorn exited before serving requests")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"server not ready after {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    for label, create_tables in (("create_all", "true"), ("skip create_all", "false")):
+        env = {**os.environ, "DB_CREATE_TABLES_ON_STARTUP": create_tables, "TOKEN_REAPER_ENABLED": "false"}
+        imports = [measure_import(env) for _ in range(args.runs)]
+        ready = [measure_ready(env, args.timeout) for _ in range(args.runs)]
+        print(
+            f"{label:>16}: import median {statistics.median(imports) * 1000:.0f} ms (min {min(imports) * 1000:.0f}) | "
+            f"ready median {statistics.median(ready) * 1000:.0f} ms (min {min(ready) * 1000:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
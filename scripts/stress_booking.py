@@ -0,0 +1,117 @@
+"""Prueba de carga de reservas concurrentes contra una API en ejecución.
+
+Lanza reservas aleatorias desde varios hilos sobre unas pocas habitaciones y, al final,
+verifica en la base de datos (DATABASE_URL del .env) que no haya estancias solapadas.
+
+    python scripts/stress_booking.py --base-url http://127.0.0.1:8000 --username admin --password secret \\
+        --rooms 1,2,3,4 --threads 16 --requests 500
+
+Retorna código 1 si encuentra solapes. Con SQLite (sin bloqueo de filas) la exclusión es por
+proceso: levante la API con un solo worker.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def login(base_url: str, username: str, password: str) -> str:
+    response = httpx.post(f"{base_url}/api/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["acces_token"]
+
+
+def count_overlaps(room_ids: list[int]) -> int:
+    # importación diferida: la conexión usa el mismo .env que la API
+    from sqlalchemy import func
+    from sqlalchemy.orm import aliased
+    from sqlmodel import Session, select
+
+    import app.main  # noqa: F401  registra todos los modelos
+    from core.availability import cancelled_status_ids
+    from core.database import engine
+    from models.reservation import Reservation
+
+    first, second = aliased(Reservation), aliased(Reservation)
+    query = (
+        select(func.count())
+        .select_from(first)
+        .join(
+            second,
+            (first.room_id == second.room_id)
+            & (first.id < second.id)
+            & (first.check_in_date < second.check_out_date)
+            & (second.check_in_date < first.check_out_date),
+        )
+        .where(
+            first.room_id.in_(room_ids),
+            first.reservation_status_id.not_in(cancelled_status_ids()),
+            second.reservation_status_id.not_in(cancelled_status_ids()),
+        )
+    )
+    with Session(engine) as session:
+        return session.exec(query).one()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--rooms", required=True, help="ids de habitación separados por comas")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--days", type=int, default=60, help="ventana de fechas en la que caen las reservas")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today() + timedelta(days=365))
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--client-id", type=int, default=1)
+    parser.add_argument("--status-id", type=int, default=1)
+    args = parser.parse_args()
+
+    room_ids = [int(room_id) for room_id in args.rooms.split(",")]
+    headers = {"Authorization": f"Bearer {login(args.base_url, args.username, args.password)}"}
+    results: Counter = Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def book(_):
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(base_url=args.base_url, headers=headers, timeout=30)
+        check_in = args.start + timedelta(days=random.randrange(args.days))
+        payload = {
+            "user_id": args.user_id,
+            "reservation_status_id": args.status_id,
+            "client_id": args.client_id,
+            "room_id": random.choice(room_ids),
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=random.randint(1, 5))).isoformat(),
+            "note": "stress",
+        }
+        status_code = local.client.post("/api/reservations/", json=payload).status_code
+        with lock:
+            results[status_code] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(book, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    overlaps = count_overlaps(room_ids)
+    print(f"requests: {args.requests} in {elapsed:.2f} s ({args.requests / elapsed:.1f} req/s)")
+    print(f"created: {results[201]} ({results[201] / elapsed:.1f} bookings/s), rejected 409: {results[409]}, "
+          f"other: {sum(n for code, n in results.items() if code not in (201, 409))} {dict(results)}")
+    print(f"overlapping stays: {overlaps}")
+    sys.exit(1 if overlaps else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+# configuración de prueba antes de importar la aplicación: SQLite en un archivo temporal
+_db_dir = tempfile.mkdtemp(prefix="hotel-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.setdefault("SECRET_KEY", "x" * 32)
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ["AUTH_MODE"] = "db"
+os.environ["IDEMPOTENCY_BACKEND"] = "memory"
+os.environ["TOKEN_REAPER_ENABLED"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+
+from app.main import app
+from core import dashboard, database, idempotency, pricing, security
+from core.database import create_db_and_tables, engine
+from models.client import Client
+from models.reservation import Reservation
+from models.reservation_status import ReservationStatus
+from models.room import Room
+from models.room_status import RoomStatus
+from models.room_type import RoomType
+from models.user import User
+from models.user_type import UserType
+
+PASSWORD = "secret1"
+_password_hash = security.hash_password(PASSWORD)
+
+
+def _sqlite_datediff(end: str, start: str) -> int:
+    return (date.fromisoformat(end) - date.fromisoformat(start)).days
+
+
+# el dashboard usa datediff de MySQL; en SQLite se registra como función de la conexión
+for _engine in (database.engine, database.async_engine.sync_engine):
+    event.listen(_engine, "connect", lambda connection, _: connection.create_function("datediff", 2, _sqlite_datediff))
+
+
+def _clear_caches():
+    for cache in (
+        security.token_cache, security.epoch_cache, pricing.room_price_cache, dashboard.room_count_cache,
+        dashboard.dashboard_cache, idempotency.completed, database.primary_pins,
+    ):
+        cache.clear()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    # un solo arranque: el apagado de la app cierra el pool de hashing de contraseñas
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def client(app_client):
+    SQLModel.metadata.drop_all(engine)
+    create_db_and_tables()
+    _clear_caches()
+    yield app_client
+
+
+@pytest.fixture
+def seed(client):
+    """Datos mínimos: usuario admin, estados (Pendiente, Confirmada, Cancelada), un cliente y 4 habitaciones."""
+    with Session(engine) as session:
+        session.add(UserType(name="Admin", description="admin"))
+        session.add(RoomType(name="Simple", description="simple"))
+        session.add(RoomStatus(name="Disponible", description="disponible"))
+        for name in ("Pendiente", "Confirmada", "Cancelada"):
+            session.add(ReservationStatus(name=name, description=name))
+        session.add(Client(first_name="Ana", last_name="Diaz", phone="1", email="ana@example.com", number_identification="9"))
+        session.commit()
+        session.add(User(username="admin", email="admin@example.com", password=_password_hash, user_type_id=1))
+        for number in range(1, 5):
+            session.add(Room(room_number=str(100 + number), price_per_night=100, capacity=2, room_type_id=1, room_status_id=1))
+        session.commit()
+    return {"user_id": 1, "client_id": 1, "room_ids": [1, 2, 3, 4], "pending": 1, "confirmed": 2, "cancelled": 3}
+
+
+@pytest.fixture
+def auth_headers(client, seed):
+    response = client.post("/api/login", json={"username": "admin", "password": PASSWORD})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['acces_token']}"}
+
+
+@pytest.fixture
+def reservation_payload(seed):
+    """Fábrica del cuerpo de POST /api/reservations/: reserva confirmada del usuario y cliente sembrados."""
+    def build(room_id: int = 1, check_in="2030-05-01", check_out="2030-05-03", **overrides) -> dict:
+        return {
+            "user_id": seed["user_id"], "reservation_status_id": seed["confirmed"], "client_id": seed["client_id"],
+            "room_id": room_id, "check_in_date": str(check_in), "check_out_date": str(check_out), "note": "",
+            **overrides,
+        }
+    return build
+
+
+@pytest.fixture
+def book(client, auth_headers, reservation_payload):
+    """Crea una reserva por la API y retorna su cuerpo; falla la prueba si no se crea."""
+    def create(room_id: int = 1, check_in="2030-05-01", check_out="2030-05-03", **overrides) -> dict:
+        response = client.post("/api/reservations/", headers=auth_headers, json=reservation_payload(room_id, check_in, check_out, **overrides))
+        assert response.status_code == 201, response.json()
+        return response.json()
+    return create
+
+
+@pytest.fixture
+def add_reservations(seed):
+    """Inserta reservas confirmadas directamente en la base: (room_id, check_in, check_out, total, client_id)."""
+    def insert(*stays):
+        with Session(engine) as session:
+            for room_id, check_in, check_out, total, client_id in stays:
+                session.add(Reservation(
+                    user_id=seed["user_id"], reservation_status_id=seed["confirmed"], client_id=client_id,
+                    room_id=room_id, check_in_date=check_in, check_out_date=check_out, note="", total=Decimal(total),
+                ))
+            session.commit()
+    return insert
\ No newline at end of file
@@ -0,0 +1,39 @@
+import pytest
+
+
+def available_room_ids(client, headers, check_in: str, check_out: str) -> list[int]:
+    response = client.get(f"/api/room/availability?check_in={check_in}&check_out={check_out}", headers=headers)
+    assert response.status_code == 200, response.json()
+    return [room["id"] for room in response.json()]
+
+
+@pytest.mark.parametrize("check_in, check_out", [("2030-05-03", "2030-05-03"), ("2030-05-05", "2030-05-03")])
+def test_empty_or_reversed_range_is_rejected(client, auth_headers, check_in, check_out):
+    response = client.get(f"/api/room/availability?check_in={check_in}&check_out={check_out}", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "check_out must be after check_in"
+
+
+def test_cancelled_reservation_frees_the_room(client, auth_headers, seed, book):
+    reservation_id = book(1, "2030-05-01", "2030-05-05")["id"]
+    assert available_room_ids(client, auth_headers, "2030-05-02", "2030-05-03") == [2, 3, 4]
+
+    cancelled = client.patch(f"/api/reservations/{reservation_id}", headers=auth_headers,
+                             json={"reservation_status_id": seed["cancelled"]})
+    assert cancelled.status_code == 200
+    assert available_room_ids(client, auth_headers, "2030-05-02", "2030-05-03") == [1, 2, 3, 4]
+
+    # una reserva creada ya cancelada tampoco ocupa la habitación
+    book(2, "2030-05-01", "2030-05-05", reservation_status_id=seed["cancelled"])
+    assert available_room_ids(client, auth_headers, "2030-05-01", "2030-05-05") == [1, 2, 3, 4]
+
+
+def test_back_to_back_stays_do_not_conflict(client, auth_headers, book):
+    book(1, "2030-05-03", "2030-05-05")
+    assert 1 in available_room_ids(client, auth_headers, "2030-05-01", "2030-05-03")  # sale el día que entra la otra
+    assert 1 in available_room_ids(client, auth_headers, "2030-05-05", "2030-05-07")  # entra el día que sale la otra
+    assert 1 not in available_room_ids(client, auth_headers, "2030-05-04", "2030-05-06")
+
+    book(1, "2030-05-01", "2030-05-03")
+    book(1, "2030-05-05", "2030-05-07")
+    assert 1 not in available_room_ids(client, auth_headers, "2030-05-01", "2030-05-07")
@@ -0,0 +1,169 @@
+import asyncio
+import importlib.util
+import os
+from datetime import date
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core import dashboard
+from core.database import async_engine
+from core.logging_config import RequestQueryStats, request_query_stats
+
+BENCH_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "bench_dashboard.py")
+
+
+def run_with_stats(coroutine_factory):
+    async def run():
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+        try:
+            async with AsyncSession(async_engine) as session:
+                return await coroutine_factory(session), stats
+        finally:
+            request_query_stats.reset(token)
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def march(seed, add_reservations):
+    add_reservations(
+        (1, date(2025, 3, 1), date(2025, 3, 4), 300, 1),   # primer día del mes: incluida
+        (2, date(2025, 3, 31), date(2025, 4, 2), 200, 1),  # último día del mes: incluida
+        (3, date(2025, 2, 28), date(2025, 3, 3), 999, 1),  # entra en febrero: excluida
+        (4, date(2025, 4, 1), date(2025, 4, 5), 999, 1),   # primer día del mes siguiente: excluida
+    )
+    return seed
+
+
+def test_month_bounds_are_half_open():
+    assert dashboard.month_bounds(3, 2025) == (date(2025, 3, 1), date(2025, 4, 1))
+    assert dashboard.month_bounds(12, 2025) == (date(2025, 12, 1), date(2026, 1, 1))
+
+
+def test_metrics_use_one_aggregate_query_with_cached_room_count(march):
+    metrics, cold = run_with_stats(lambda session: dashboard.dashboard_metrics(session, 3, 2025))
+    assert metrics == {"total_recaudo": 500.0, "porcentaje_ocupacion": 50.0, "promedio_dias": 2.5, "total_clientes": 1}
+    assert cold.count == 2  # agregado + total de habitaciones
+
+    _, warm = run_with_stats(lambda session: dashboard.dashboard_metrics(session, 3, 2025))
+    assert warm.count == 1
+
+
+def test_empty_month(seed):
+    metrics, _ = run_with_stats(lambda session: dashboard.dashboard_metrics(session, 7, 2025))
+    assert metrics == {"total_recaudo": 0.0, "porcentaje_ocupacion": 0.0, "promedio_dias": 0, "total_clientes": 0}
+
+
+def test_matches_previous_implementation(march):
+    spec = importlib.util.spec_from_file_location("bench_dashboard", BENCH_PATH)
+    bench = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bench)
+    for month in (2, 3, 4):
+        legacy, _ = run_with_stats(lambda session: bench.legacy_dashboard(session, month, 2025))
+        current, _ = run_with_stats(lambda session: dashboard.dashboard_metrics(session, month, 2025))
+        assert current == legacy
+
+def get_dashboard(client, headers, month: int = 3, year: int = 2025):
+    response = client.get(f"/api/dashboard?month={month}&year={year}", headers=headers)
+    assert response.status_code == 200
+    return response.json(), int(response.headers["X-DB-Queries"])
+
+
+def test_cached_month_runs_no_queries(client, auth_headers, march):
+    first, _ = get_dashboard(client, auth_headers)
+    second, queries = get_dashboard(client, auth_headers)
+    assert second == first
+    assert queries == 0
+
+
+def test_reservation_writes_invalidate_their_months(client, auth_headers, march, book):
+    before, _ = get_dashboard(client, auth_headers)
+    april, _ = get_dashboard(client, auth_headers, month=4)
+
+    created = book(3, "2025-03-10", "2025-03-12")
+    after_create, _ = get_dashboard(client, auth_headers)
+    assert after_create["total_recaudo"] == before["total_recaudo"] + 200
+
+    # mover la estancia a abril invalida ambos meses
+    reservation_id = created["id"]
+    moved = client.patch(f"/api/reservations/{reservation_id}", headers=auth_headers,
+                         json={"check_in_date": "2025-04-10", "check_out_date": "2025-04-12"})
+    assert moved.status_code == 200
+    assert get_dashboard(client, auth_headers)[0] == before
+    assert get_dashboard(client, auth_headers, month=4)[0]["total_recaudo"] == april["total_recaudo"] + 200
+
+    assert client.delete(f"/api/reservations/{reservation_id}", headers=auth_headers).status_code == 200
+    assert get_dashboard(client, auth_headers, month=4)[0] == april
+
+
+def test_room_creation_invalidates_every_month(client, auth_headers, march):
+    before, _ = get_dashboard(client, auth_headers)
+    response = client.post("/api/room", headers=auth_headers, json={
+        "room_number": "999", "price_per_night": 50, "capacity": 1, "room_type_id": 1, "room_status_id": 1,
+    })
+    assert response.status_code == 201
+    after, _ = get_dashboard(client, auth_headers)
+    assert before["porcentaje_ocupacion"] == 50.0
+    assert after["porcentaje_ocupacion"] == 40.0
+
+
+def test_concurrent_misses_run_one_aggregation(march):
+    async def burst(session):
+        await dashboard.get_room_count(session)
+        sessions = [AsyncSession(async_engine) for _ in range(20)]
+        try:
+            return await asyncio.gather(*[dashboard.cached_dashboard_metrics(s, 3, 2025) for s in sessions])
+        finally:
+            for s in sessions:
+                await s.close()
+
+    results, stats = run_with_stats(burst)
+    assert len({str(result) for result in results}) == 1
+    assert stats.count == 2  # total de habitaciones + un solo agregado
+
+
+def test_fill_started_before_invalidation_is_not_cached(march, monkeypatch):
+    original = dashboard.dashboard_metrics
+
+    async def write_during_aggregation(session, month, year):
+        metrics = await original(session, month, year)
+        dashboard.invalidate_dashboard(date(year, month, 15))  # una reserva se confirma mientras tanto
+        return metrics
+
+    monkeypatch.setattr(dashboard, "dashboard_metrics", write_during_aggregation)
+    run_with_stats(lambda session: dashboard.cached_dashboard_metrics(session, 3, 2025))
+    assert dashboard.dashboard_cache.get((3, 2025)) is None
+
+    monkeypatch.setattr(dashboard, "dashboard_metrics", original)
+    run_with_stats(lambda session: dashboard.cached_dashboard_metrics(session, 3, 2025))
+    assert dashboard.dashboard_cache.get((3, 2025)) is not None
+
+def test_failed_aggregation_wakes_waiters_to_retry(march, monkeypatch):
+    original = dashboard.dashboard_metrics
+    calls = []
+
+    async def fail_first(session, month, year):
+        calls.append(month)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            raise RuntimeError("db down")
+        return await original(session, month, year)
+
+    monkeypatch.setattr(dashboard, "dashboard_metrics", fail_first)
+
+    async def burst(session):
+        other = AsyncSession(async_engine)
+        try:
+            return await asyncio.gather(
+                dashboard.cached_dashboard_metrics(session, 3, 2025),
+                dashboard.cached_dashboard_metrics(other, 3, 2025),
+                return_exceptions=True,
+            )
+        finally:
+            await other.close()
+
+    (failed, retried), _ = run_with_stats(burst)
+    assert isinstance(failed, RuntimeError)
+    assert retried["total_recaudo"] == 500.0
+    assert len(calls) == 2 and len(dashboard.dashboard_in_flight) == 0
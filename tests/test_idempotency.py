@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+from sqlmodel import Session, func, select
+
+from app.main import app
+from core import idempotency
+from core.config import settings
+from core.database import engine
+from models.idempotency_key import IdempotencyKey
+from models.reservation import Reservation
+
+
+def reservation_count() -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count(Reservation.id))).one()
+
+
+def test_retry_with_same_key_replays_the_original_response(client, auth_headers, reservation_payload):
+    headers = {**auth_headers, "Idempotency-Key": "retry-1"}
+    first = client.post("/api/reservations/", headers=headers, json=reservation_payload())
+    second = client.post("/api/reservations/", headers=headers, json=reservation_payload())
+
+    assert first.status_code == second.status_code == 201
+    assert second.json()["id"] == first.json()["id"]
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert reservation_count() == 1
+
+
+def test_same_key_with_different_body_is_rejected(client, auth_headers, reservation_payload):
+    headers = {**auth_headers, "Idempotency-Key": "retry-2"}
+    client.post("/api/reservations/", headers=headers, json=reservation_payload())
+    response = client.post("/api/reservations/", headers=headers, json=reservation_payload(room_id=2))
+    assert response.status_code == 422
+    assert reservation_count() == 1
+
+
+def test_requests_without_key_are_not_deduplicated(client, auth_headers, reservation_payload):
+    client.post("/api/reservations/", headers=auth_headers, json=reservation_payload(room_id=1))
+    client.post("/api/reservations/", headers=auth_headers, json=reservation_payload(room_id=2))
+    assert reservation_count() == 2
+
+
+def test_concurrent_duplicates_insert_once(client, auth_headers, reservation_payload):
+    headers = {**auth_headers, "Idempotency-Key": "burst-1"}
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            return await asyncio.gather(*[
+                async_client.post("/api/reservations/", headers=headers, json=reservation_payload())
+                for _ in range(10)
+            ])
+
+    responses = asyncio.run(burst())
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert sum(response.headers.get("Idempotent-Replayed") == "true" for response in responses) == 9
+    assert reservation_count() == 1
+
+
+def test_db_backend_replays_across_workers(client, auth_headers, reservation_payload, monkeypatch):
+    monkeypatch.setattr(settings, "IDEMPOTENCY_BACKEND", "db")
+    monkeypatch.setattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 0)
+    headers = {**auth_headers, "Idempotency-Key": "shared-1"}
+    first = client.post("/api/reservations/", headers=headers, json=reservation_payload())
+    assert first.status_code == 201
+
+    # otro worker no tiene la respuesta en memoria: la encuentra en la tabla
+    idempotency.completed.clear()
+    replay = client.post("/api/reservations/", headers=headers, json=reservation_payload())
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json()["id"] == first.json()["id"]
+
+    # la petición original sigue en curso en otro worker: tras la espera se responde 409
+    with Session(engine) as session:
+        record = session.exec(select(IdempotencyKey)).one()
+        record.status_code = None
+        session.add(record)
+        session.commit()
+    idempotency.completed.clear()
+    in_progress = client.post("/api/reservations/", headers=headers, json=reservation_payload())
+    assert in_progress.status_code == 409
+    assert reservation_count() == 1
+
+def test_retry_after_relogin_replays_instead_of_booking_again(client, auth_headers, reservation_payload):
+    first = client.post("/api/reservations/", headers={**auth_headers, "Idempotency-Key": "relogin-1"}, json=reservation_payload())
+
+    # el cliente renueva su sesión antes de reintentar: el token cambia pero el usuario no
+    token = client.post("/api/login", json={"username": "admin", "password": "secret1"}).json()["acces_token"]
+    retry = client.post("/api/reservations/", headers={"Authorization": f"Bearer {token}", "Idempotency-Key": "relogin-1"},
+                        json=reservation_payload())
+
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+    assert reservation_count() == 1
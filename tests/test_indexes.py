@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlmodel import SQLModel, select
+
+from core.availability import available_rooms_query, occupied_nights, overlapping_reservations
+from core.dashboard import month_bounds
+from core.database import load_models
+from models.reservation import Reservation
+from models.user import User
+
+
+@pytest.fixture(scope="module")
+def schema_engine():
+    # esquema creado solo con create_all: los índices deben venir declarados en los modelos
+    load_models()
+    test_engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+def query_plan(test_engine, query) -> str:
+    sql = str(query.compile(dialect=test_engine.dialect, compile_kwargs={"literal_binds": True}))
+    with test_engine.connect() as connection:
+        return "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def test_dashboard_month_filter_uses_check_in_index(schema_engine):
+    start, end = month_bounds(3, 2025)
+    query = select(func.sum(Reservation.total), func.count(Reservation.id)).where(
+        Reservation.check_in_date >= start, Reservation.check_in_date < end
+    )
+    assert "ix_reservation_check_in_date" in query_plan(schema_engine, query)
+
+
+def test_overlap_probe_uses_room_dates_index(schema_engine):
+    query = overlapping_reservations(date(2025, 3, 10), date(2025, 3, 12), room_id=1)
+    assert "ix_reservation_room_id_" in query_plan(schema_engine, query)
+
+
+def test_conflict_probe_uses_room_night_key(schema_engine):
+    query = occupied_nights(date(2025, 3, 10), date(2025, 3, 12), room_id=1)
+    assert "SEARCH room_night USING INDEX sqlite_autoindex_room_night_1 (room_id=? AND night>? AND night<?)" in query_plan(schema_engine, query)
+
+
+def test_availability_anti_join_uses_room_night_key(schema_engine):
+    query = available_rooms_query(date(2025, 3, 10), date(2025, 3, 12))
+    assert "SEARCH room_night USING INDEX sqlite_autoindex_room_night_1 (room_id=? AND night>? AND night<?)" in query_plan(schema_engine, query)
+
+
+def test_username_lookup_uses_index(schema_engine):
+    query = select(User).where(User.username == "admin")
+    assert "ix_user_username" in query_plan(schema_engine, query)
\ No newline at end of file
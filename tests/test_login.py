@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, func, select
+
+from core.config import settings
+from core.database import async_engine, engine
+from core.security import epoch_cache, token_cache, token_digest
+from models.token import Token
+
+
+def add_stale_tokens(user_id: int, count: int):
+    with Session(engine) as session:
+        for index in range(count):
+            token = f"stale-token-{index}"
+            session.add(Token(
+                user_id=user_id, token=token, token_hash=token_digest(token), status_token=True,
+                expiration=datetime.utcnow() + timedelta(minutes=30),
+            ))
+        session.commit()
+
+
+@pytest.mark.parametrize("stale_tokens", [0, 1, 25])
+def test_login_rotates_tokens_with_fixed_statement_count(client, seed, stale_tokens):
+    add_stale_tokens(seed["user_id"], stale_tokens)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/api/login", json={"username": "admin", "password": "secret1"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    # SELECT del usuario, UPDATE de los tokens anteriores e INSERT del nuevo
+    assert len(statements) == 3, statements
+    with Session(engine) as session:
+        active = session.exec(select(func.count(Token.id)).where(Token.status_token == True)).one()
+    assert active == 1
+
+def test_epoch_mode_accepts_token_newer_than_cached_version(client, seed, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_MODE", "epoch")
+    first = client.post("/api/login", json={"username": "admin", "password": "secret1"}).json()["acces_token"]
+    assert client.get("/api/user", headers={"Authorization": f"Bearer {first}"}).status_code == 200
+    stale_entry = epoch_cache.get("admin")
+
+    # login atendido por otro worker: este conserva en caché la versión anterior
+    second = client.post("/api/login", json={"username": "admin", "password": "secret1"}).json()["acces_token"]
+    epoch_cache.set("admin", stale_entry)
+
+    assert client.get("/api/user", headers={"Authorization": f"Bearer {second}"}).status_code == 200
+    revoked = client.get("/api/user", headers={"Authorization": f"Bearer {first}"})
+    assert revoked.status_code == 401
+    assert revoked.json()["detail"] == "Token has been revoked."
+
+def test_profile_edit_keeps_sessions_and_password_change_revokes_them(client, seed, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_MODE", "epoch")
+    token = client.post("/api/login", json={"username": "admin", "password": "secret1"}).json()["acces_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    profile = {"username": "admin", "email": "admin2@example.com", "password": "secret1", "user_type_id": 1, "active": True}
+
+    assert client.patch(f"/api/user/{seed['user_id']}", headers=headers, json=profile).status_code == 200
+    assert client.get("/api/user", headers=headers).status_code == 200
+
+    changed = client.patch(f"/api/user/{seed['user_id']}", headers=headers, json={**profile, "password": "secret2"})
+    assert changed.status_code == 200
+    assert client.get("/api/user", headers=headers).status_code == 401
+
+
+@pytest.mark.parametrize("auth_mode", ["db", "epoch"])
+@pytest.mark.parametrize("action, expected_status", [
+    (lambda client, headers, user_id: client.post("/api/logout", headers=headers), 401),
+    (lambda client, headers, user_id: client.patch(f"/api/user/{user_id}/password", headers=headers, json={"password": "secret2"}), 401),
+    (lambda client, headers, user_id: client.patch(f"/api/user/{user_id}/status", headers=headers, json={"active": False}), 403),
+], ids=["logout", "password", "status"])
+def test_cached_token_stops_working_after_revocation(client, seed, monkeypatch, auth_mode, action, expected_status):
+    monkeypatch.setattr(settings, "AUTH_MODE", auth_mode)
+    token = client.post("/api/login", json={"username": "admin", "password": "secret1"}).json()["acces_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/user", headers=headers).status_code == 200
+    # la validación quedó en caché: la revocación debe sacarla
+    assert (token_cache.get(token_digest(token)) if auth_mode == "db" else epoch_cache.get("admin")) is not None
+
+    assert action(client, headers, seed["user_id"]).status_code == 200
+    assert client.get("/api/user", headers=headers).status_code == expected_status
@@ -0,0 +1,49 @@
+import base64
+from datetime import date
+
+import numpy as np
+
+from core.occupancy import encode_bitset, encode_rle, occupancy_grid
+
+START = date(2030, 5, 1)
+
+
+def decode_bitset(value: str, days: int) -> list[int]:
+    return np.unpackbits(np.frombuffer(base64.b64decode(value), dtype=np.uint8))[:days].tolist()
+
+
+def decode_rle(runs: list[int]) -> list[int]:
+    # tramos alternos empezando por noches libres
+    return [index % 2 for index, run in enumerate(runs) for _ in range(run)]
+
+
+def test_grid_round_trips_through_both_encodings():
+    intervals = [
+        (10, date(2030, 4, 29), date(2030, 5, 3)),  # entra antes de la ventana: se recorta al inicio
+        (10, date(2030, 5, 5), date(2030, 5, 6)),
+        (10, date(2030, 5, 5), date(2030, 5, 7)),   # solape antiguo en la misma habitación
+        (20, date(2030, 5, 7), date(2030, 5, 12)),  # sale después de la ventana: se recorta al final
+        (99, date(2030, 5, 1), date(2030, 5, 3)),   # habitación fuera de la lista
+    ]
+    grid = occupancy_grid([10, 20, 30], intervals, START, 9)
+    expected = [
+        [1, 1, 0, 0, 1, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1, 1, 1],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ]
+    assert grid.tolist() == expected
+    for row, nights in zip(grid, expected):
+        assert decode_bitset(encode_bitset(row), 9) == nights
+        assert decode_rle(encode_rle(row)) == nights
+    assert encode_rle(grid[0]) == [0, 2, 2, 2, 3]
+    assert encode_rle(grid[2]) == [9]
+
+
+def test_grid_endpoint_encodes_each_active_room(client, auth_headers, book):
+    book(1, "2030-04-30", "2030-05-02")
+    book(2, "2030-05-03", "2030-05-09")
+    for encoding, decode in (("bitset", lambda value: decode_bitset(value, 4)), ("rle", decode_rle)):
+        response = client.get(f"/api/reservations/grid?start=2030-05-01&days=4&encoding={encoding}", headers=auth_headers)
+        assert response.status_code == 200
+        rooms = {room["room_id"]: decode(room["nights"]) for room in response.json()["rooms"]}
+        assert rooms == {1: [1, 0, 0, 0], 2: [0, 0, 1, 1], 3: [0, 0, 0, 0], 4: [0, 0, 0, 0]}
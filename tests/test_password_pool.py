@@ -0,0 +1,56 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from app.main import app
+from core import security
+from core.config import settings
+
+CREDENTIALS = {"username": "admin", "password": "secret1"}
+
+
+def test_saturated_pool_rejects_with_503_and_reports_its_queue(client, auth_headers, monkeypatch):
+    # un solo hilo y dos operaciones como máximo; cada verificación espera hasta que la prueba la libere
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    original_verify = security.verify_password
+
+    def blocked_verify(plain_password, hashed_password):
+        release.wait(5)
+        return original_verify(plain_password, hashed_password)
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    monkeypatch.setattr(security, "password_executor", executor)
+    monkeypatch.setattr(security, "verify_password", blocked_verify)
+    before = security.password_pool_stats()
+
+    async def saturate():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            logins = [asyncio.create_task(async_client.post("/api/login", json=CREDENTIALS)) for _ in range(2)]
+            try:
+                while security.password_pool_stats()["pending"] < 2:
+                    await asyncio.sleep(0.01)
+                rejected = await async_client.post("/api/login", json=CREDENTIALS)
+                stats = (await async_client.get("/api/metrics/password-pool", headers=auth_headers)).json()
+            finally:
+                release.set()
+            return rejected, stats, await asyncio.gather(*logins)
+
+    try:
+        rejected, stats, logins = asyncio.run(saturate())
+    finally:
+        executor.shutdown(wait=True)
+
+    assert rejected.status_code == 503
+    assert [login.status_code for login in logins] == [200, 200]
+    assert {key: stats[key] for key in ("workers", "max_pending", "pending", "queue_depth")} == {
+        "workers": 1, "max_pending": 2, "pending": 2, "queue_depth": 1,
+    }
+    after = security.password_pool_stats()
+    assert after["pending"] == 0
+    assert after["rejected"] == before["rejected"] + 1
+    assert after["completed"] == before["completed"] + 2
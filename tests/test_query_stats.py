@@ -0,0 +1,46 @@
+import logging
+from datetime import date, timedelta
+
+from core.config import settings
+from core.logging_config import RequestQueryStats
+
+
+def test_responses_carry_query_count_and_time(client, auth_headers):
+    response = client.get("/api/room", headers=auth_headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) >= 1
+    assert float(response.headers["X-DB-Time-ms"]) >= 0
+
+
+def test_budget_overrun_logs_repeated_fingerprints(client, auth_headers, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        client.get("/api/room", headers=auth_headers)
+    assert any("Query budget exceeded route=GET /api/room" in record.getMessage() for record in caplog.records)
+
+
+def test_fingerprints_group_statements_that_differ_in_in_lists():
+    stats = RequestQueryStats()
+    stats.record("SELECT * FROM room WHERE id IN (?, ?)", 1.0)
+    stats.record("SELECT *  FROM room\nWHERE id IN (?, ?, ?)", 2.0)
+    stats.record("SELECT * FROM client", 1.0)
+    assert stats.count == 3
+    assert stats.time_ms == 4.0
+    assert stats.repeated() == [("SELECT * FROM room WHERE id IN (?)", 2)]
+
+
+def test_expanded_reservation_list_does_not_grow_with_rows(client, auth_headers, seed, book):
+    def book_two_nights(room_id: int, check_in: date):
+        book(room_id, check_in, check_in + timedelta(days=2))
+
+    check_in = date(2030, 1, 1)
+    for index, room_id in enumerate(seed["room_ids"][:2]):
+        book_two_nights(room_id, check_in + timedelta(days=10 * index))
+    few = client.get("/api/reservations/?expand=room,client,status,user", headers=auth_headers)
+
+    for index in range(8):
+        book_two_nights(seed["room_ids"][2 + index % 2], check_in + timedelta(days=10 * index))
+    many = client.get("/api/reservations/?expand=room,client,status,user", headers=auth_headers)
+
+    assert len(many.json()) == 10
+    assert many.headers["X-DB-Queries"] == few.headers["X-DB-Queries"]
\ No newline at end of file
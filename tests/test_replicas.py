@@ -0,0 +1,76 @@
+import asyncio
+import itertools
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.main import pin_writes_to_primary
+from core import database
+from models.room import Room
+
+AVAILABILITY = "/api/room/availability?check_in=2030-05-01&check_out=2030-05-02"
+
+
+@pytest.fixture
+def replicas(seed, tmp_path, monkeypatch):
+    """Dos réplicas SQLite con una sola habitación cada una (replica-0 y replica-1) para saber quién respondió."""
+    engines = []
+    for index in range(2):
+        path = tmp_path / f"replica-{index}.db"
+        sync_engine = create_engine(f"sqlite:///{path}")
+        SQLModel.metadata.create_all(sync_engine)
+        with Session(sync_engine) as session:
+            session.add(Room(room_number=f"replica-{index}", price_per_night=100, capacity=2, room_type_id=1, room_status_id=1))
+            session.commit()
+        sync_engine.dispose()
+        engines.append(database.create_instrumented_async_engine(database.async_database_url(f"sqlite:///{path}")))
+    monkeypatch.setattr(database, "replica_engines", engines)
+    monkeypatch.setattr(database, "_replica_cycle", itertools.cycle(engines))
+    yield engines
+    for replica in engines:
+        asyncio.run(replica.dispose())
+
+
+def room_numbers(client, headers, **extra_headers) -> list[str]:
+    response = client.get(AVAILABILITY, headers={**headers, **extra_headers})
+    assert response.status_code == 200
+    return [room["room_number"] for room in response.json()]
+
+
+def request_for(method: str, headers: dict) -> Request:
+    return Request({
+        "type": "http", "method": method, "path": "/api/reservations/", "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_reads_rotate_across_replicas(client, auth_headers, replicas):
+    assert [room_numbers(client, auth_headers) for _ in range(4)] == [["replica-0"], ["replica-1"], ["replica-0"], ["replica-1"]]
+
+
+def test_read_primary_header_overrides_replicas(client, auth_headers, replicas):
+    assert room_numbers(client, auth_headers, **{"X-Read-Primary": "true"}) == ["101", "102", "103", "104"]
+    assert room_numbers(client, auth_headers)[0].startswith("replica-")
+
+
+def test_successful_write_pins_the_client_to_primary(client, auth_headers, replicas):
+    async def write(status_code: int, headers: dict):
+        async def call_next(request):
+            return Response(status_code=status_code)
+        await pin_writes_to_primary(request_for("POST", headers), call_next)
+
+    # una escritura rechazada no fija al cliente
+    asyncio.run(write(409, auth_headers))
+    assert room_numbers(client, auth_headers)[0].startswith("replica-")
+
+    asyncio.run(write(201, auth_headers))
+    assert room_numbers(client, auth_headers) == ["101", "102", "103", "104"]
+    assert database.read_engine_for(request_for("GET", auth_headers)) is database.async_engine
+    # otros clientes siguen leyendo de las réplicas
+    assert database.read_engine_for(request_for("GET", {"Authorization": "Bearer other"})) in replicas
+
+    # al vencer el pin vuelve a las réplicas
+    database.primary_pins.clear()
+    assert room_numbers(client, auth_headers)[0].startswith("replica-")
@@ -0,0 +1,164 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date
+
+import httpx
+import pytest
+from sqlmodel import Session, func, select
+
+from app.main import app
+from core.config import settings
+from core.database import async_engine, engine
+from models.reservation import Reservation
+from routers.reservations import stream_reservations
+
+
+@pytest.mark.parametrize("check_in, check_out", [("2030-05-08", "2030-05-06"), ("2030-05-08", "2030-05-08")])
+def test_empty_or_reversed_stays_are_rejected(client, auth_headers, seed, reservation_payload, check_in, check_out):
+    created = client.post("/api/reservations/", headers=auth_headers, json=reservation_payload(check_in=check_in, check_out=check_out))
+    assert created.status_code == 400
+    assert created.json()["detail"] == "check_out must be after check_in"
+
+    cancelled = reservation_payload(check_in=check_in, check_out=check_out, reservation_status_id=seed["cancelled"])
+    assert client.post("/api/reservations/", headers=auth_headers, json=cancelled).status_code == 400
+
+    valid = client.post("/api/reservations/", headers=auth_headers, json=reservation_payload())
+    updated = client.patch(f"/api/reservations/{valid.json()['id']}", headers=auth_headers,
+                           json={"check_in_date": check_in, "check_out_date": check_out})
+    assert updated.status_code == 400
+
+    bulk = client.post("/api/reservations/bulk", headers=auth_headers, json={"atomic": False, "reservations": [
+        reservation_payload(room_id=2, check_in=check_in, check_out=check_out), reservation_payload(room_id=3),
+    ]})
+    assert [result["status_code"] for result in bulk.json()["results"]] == [400, 201]
+
+    # la cotización informa el rango inválido en su item sin hacer fallar el resto del lote
+    quote = client.post("/api/reservations/quote", headers=auth_headers, json={"items": [
+        {"room_id": 1, "check_in_date": check_in, "check_out_date": check_out},
+        {"room_id": 1, "check_in_date": "2030-05-01", "check_out_date": "2030-05-03"},
+        {"room_id": 99, "check_in_date": "2030-05-01", "check_out_date": "2030-05-03"},
+    ]})
+    assert quote.status_code == 200
+    invalid, valid, missing = quote.json()["quotes"]
+    assert (invalid["nights"], invalid["total"], invalid["detail"]) == (None, None, "check_out must be after check_in")
+    assert (valid["nights"], float(valid["total"]), valid["detail"]) == (2, 200.0, None)
+    assert (missing["nights"], missing["total"], missing["detail"]) == (2, None, "Room not found")
+
+
+def test_concurrent_bookings_of_one_room_do_not_overlap(client, auth_headers, reservation_payload):
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            return await asyncio.gather(*[
+                async_client.post("/api/reservations/", headers=auth_headers,
+                                  json=reservation_payload(check_in=f"2030-06-{1 + index % 3:02}", check_out="2030-06-05"))
+                for index in range(12)
+            ])
+
+    responses = asyncio.run(burst())
+    assert sorted(response.status_code for response in responses) == [201] + [409] * 11
+    with Session(engine) as session:
+        assert session.exec(select(func.count(Reservation.id))).one() == 1
+
+def test_bulk_maps_created_ids_to_their_items_and_rejects_conflicts(client, auth_headers, seed, reservation_payload, book):
+    existing = [book(1, "2030-05-01", "2030-05-03")["id"], book(4, "2030-05-01", "2030-05-03")["id"]]
+    items = [
+        reservation_payload(2, "2030-05-01", "2030-05-03"),
+        reservation_payload(1, "2030-05-02", "2030-05-04"),  # choca con una reserva existente
+        reservation_payload(3, "2030-05-01", "2030-05-02"),
+        reservation_payload(2, "2030-05-02", "2030-05-05"),  # choca con el item 0 del mismo lote
+        reservation_payload(2, "2030-05-03", "2030-05-05"),  # entra el día que sale el item 0
+        reservation_payload(2, "2030-05-01", "2030-05-03", reservation_status_id=seed["cancelled"]),
+    ]
+    response = client.post("/api/reservations/bulk", headers=auth_headers, json={"atomic": False, "reservations": items})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 4
+    assert [result["status_code"] for result in body["results"]] == [201, 409, 201, 409, 201, 201]
+
+    created_ids = []
+    for item, result in zip(items, body["results"]):
+        if result["status_code"] != 201:
+            continue
+        reservation = result["reservation"]
+        created_ids.append(reservation["id"])
+        # el id devuelto corresponde a la fila insertada para ese item
+        stored = client.get(f"/api/reservations/{reservation['id']}", headers=auth_headers).json()
+        for field in ("room_id", "check_in_date", "check_out_date", "reservation_status_id"):
+            assert reservation[field] == stored[field] == item[field]
+    assert len(set(created_ids)) == 4 and not set(created_ids) & set(existing)
+
+
+def test_atomic_bulk_with_conflict_inside_the_batch_inserts_nothing(client, auth_headers, reservation_payload):
+    response = client.post("/api/reservations/bulk", headers=auth_headers, json={"reservations": [
+        reservation_payload(1, "2030-05-01", "2030-05-04"),
+        reservation_payload(1, "2030-05-03", "2030-05-06"),
+    ]})
+    assert response.status_code == 409
+    assert [result["index"] for result in response.json()["detail"]] == [1]
+    with Session(engine) as session:
+        assert session.exec(select(func.count(Reservation.id))).one() == 0
+
+
+@pytest.fixture
+def five_stays(add_reservations):
+    add_reservations(*[(1 + index % 4, date(2030, 1, 1 + 5 * index), date(2030, 1, 3 + 5 * index), "200.50", 1) for index in range(5)])
+
+
+def test_export_csv_and_ndjson_carry_the_same_rows(client, auth_headers, five_stays):
+    exported_csv = client.get("/api/reservations/export?format=csv", headers=auth_headers)
+    assert exported_csv.status_code == 200
+    assert exported_csv.headers["content-type"].startswith("text/csv")
+    assert "X-DB-Queries" not in exported_csv.headers  # el cuerpo se consulta después de los middlewares
+    csv_rows = list(csv.DictReader(io.StringIO(exported_csv.text)))
+
+    exported_ndjson = client.get("/api/reservations/export?format=ndjson", headers=auth_headers)
+    assert exported_ndjson.headers["content-type"].startswith("application/x-ndjson")
+    ndjson_rows = [json.loads(line) for line in exported_ndjson.text.splitlines()]
+
+    assert [row["id"] for row in csv_rows] == [str(row["id"]) for row in ndjson_rows] == ["1", "2", "3", "4", "5"]
+    assert {row["total"] for row in csv_rows} == {row["total"] for row in ndjson_rows} == {"200.5000000000"}
+    assert [row["check_in_date"] for row in csv_rows] == [row["check_in_date"] for row in ndjson_rows]
+
+
+def test_export_filters_by_half_open_check_in_range(client, auth_headers, five_stays):
+    response = client.get("/api/reservations/export?format=ndjson&check_in_from=2030-01-06&check_in_to=2030-01-16", headers=auth_headers)
+    assert [json.loads(line)["check_in_date"] for line in response.text.splitlines()] == ["2030-01-06", "2030-01-11"]
+
+
+def test_export_streams_one_chunk_per_batch(five_stays, monkeypatch):
+    monkeypatch.setattr(settings, "RESERVATION_EXPORT_BATCH_SIZE", 2)
+
+    async def collect(export_format):
+        return [chunk async for chunk in stream_reservations(async_engine, export_format, None, None)]
+
+    ndjson_chunks = asyncio.run(collect("ndjson"))
+    assert [chunk.count("\n") for chunk in ndjson_chunks] == [2, 2, 1]
+    csv_chunks = asyncio.run(collect("csv"))
+    assert csv_chunks[0].startswith("id,") and len(csv_chunks) == 4  # encabezado + 3 lotes
+
+
+def list_pages(client, headers, query: str) -> list[list[int]]:
+    """Recorre la lista siguiendo X-Next-Cursor hasta que deja de venir."""
+    pages, cursor = [], None
+    while True:
+        response = client.get(f"/api/reservations/?{query}" + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+        assert response.status_code == 200
+        pages.append([reservation["id"] for reservation in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_follow_next_cursor_to_the_end(client, auth_headers, five_stays):
+    assert list_pages(client, auth_headers, "limit=2") == [[5, 4], [3, 2], [1]]
+    # la última página llena no anuncia otra vacía
+    assert list_pages(client, auth_headers, "limit=5") == [[5, 4, 3, 2, 1]]
+
+
+def test_keyset_cursor_keeps_filters(client, auth_headers, five_stays):
+    assert list_pages(client, auth_headers, "limit=1&room_id=1") == [[5], [1]]
+    assert list_pages(client, auth_headers, "limit=2&check_in_from=2030-01-06") == [[5, 4], [3, 2]]
+    assert list_pages(client, auth_headers, "limit=2&check_in_from=2030-01-06&check_in_to=2030-01-16") == [[3, 2]]
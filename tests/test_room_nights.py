@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlmodel import Session, select
+
+from core.database import engine
+from core.room_nights import rebuild_room_nights
+from models.room_night import RoomNight
+
+
+def room_nights() -> list[tuple[int, str, int]]:
+    with Session(engine) as session:
+        rows = session.exec(select(RoomNight).order_by(RoomNight.room_id, RoomNight.night)).all()
+        return [(row.room_id, row.night.isoformat(), row.reservation_id) for row in rows]
+
+
+def test_reservation_writes_keep_room_nights_in_sync(client, auth_headers, seed, book):
+    reservation_id = book(1, "2030-05-01", "2030-05-03")["id"]
+    assert room_nights() == [(1, "2030-05-01", reservation_id), (1, "2030-05-02", reservation_id)]
+
+    def patch(**changes):
+        response = client.patch(f"/api/reservations/{reservation_id}", headers=auth_headers, json=changes)
+        assert response.status_code == 200, response.json()
+
+    patch(check_in_date="2030-05-02", check_out_date="2030-05-05")
+    assert room_nights() == [(1, night, reservation_id) for night in ("2030-05-02", "2030-05-03", "2030-05-04")]
+
+    patch(room_id=2)
+    assert [room_id for room_id, _, _ in room_nights()] == [2, 2, 2]
+
+    patch(reservation_status_id=seed["cancelled"])
+    assert room_nights() == []
+
+    patch(reservation_status_id=seed["confirmed"])
+    assert len(room_nights()) == 3
+
+    assert client.delete(f"/api/reservations/{reservation_id}", headers=auth_headers).status_code == 200
+    assert room_nights() == []
+
+
+def test_rebuild_keeps_the_first_of_overlapping_legacy_stays(client, auth_headers, seed, add_reservations):
+    add_reservations(
+        (1, date(2030, 5, 1), date(2030, 5, 4), 300, 1),  # 1: se queda con la noche del 3
+        (1, date(2030, 5, 3), date(2030, 5, 6), 300, 1),  # 2: solapa la noche del 3
+        (2, date(2030, 5, 1), date(2030, 5, 2), 100, 1),  # 3
+    )
+    assert rebuild_room_nights() == (6, 1)
+    assert room_nights() == [
+        (1, "2030-05-01", 1), (1, "2030-05-02", 1), (1, "2030-05-03", 1),
+        (1, "2030-05-04", 2), (1, "2030-05-05", 2),
+        (2, "2030-05-01", 3),
+    ]
+    # sin cambios en las reservas, reconstruir de nuevo da el mismo resultado
+    assert rebuild_room_nights() == (6, 1)
+
+    # la reserva que perdió la noche sigue siendo editable si su estancia no cambia
+    for changes in ({"reservation_status_id": seed["pending"]}, {"note": "late arrival"}):
+        response = client.patch("/api/reservations/2", headers=auth_headers, json=changes)
+        assert response.status_code == 200, response.json()
+
+    # al borrar la primera, la noche en conflicto pasa a la otra y la habitación sigue ocupada
+    assert client.delete("/api/reservations/1", headers=auth_headers).status_code == 200
+    assert room_nights()[:3] == [(1, "2030-05-03", 2), (1, "2030-05-04", 2), (1, "2030-05-05", 2)]
+    available = client.get("/api/room/availability?check_in=2030-05-03&check_out=2030-05-04", headers=auth_headers)
+    assert 1 not in [room["id"] for room in available.json()]
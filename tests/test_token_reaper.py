@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from core import token_reaper
+from core.config import settings
+from core.database import engine
+from core.security import token_cache, token_digest
+from models.token import Token
+
+
+def add_tokens(user_id: int, prefix: str, count: int, active: bool, expires_in: timedelta):
+    with Session(engine) as session:
+        for index in range(count):
+            token = f"{prefix}-{index}"
+            session.add(Token(
+                user_id=user_id, token=token, token_hash=token_digest(token), status_token=active,
+                expiration=datetime.utcnow() + expires_in,
+            ))
+        session.commit()
+
+
+def remaining_tokens() -> list[str]:
+    with Session(engine) as session:
+        return sorted(session.exec(select(Token.token)).all())
+
+
+def test_purge_deletes_in_bounded_batches_and_keeps_live_tokens(seed):
+    add_tokens(seed["user_id"], "revoked", 4, active=False, expires_in=timedelta(minutes=30))
+    add_tokens(seed["user_id"], "expired", 3, active=True, expires_in=timedelta(minutes=-1))
+    add_tokens(seed["user_id"], "live", 2, active=True, expires_in=timedelta(minutes=30))
+    batch_sizes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM token"):
+            batch_sizes.append(len(parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # el tope de lotes deja el resto para la siguiente ejecución
+        assert token_reaper.purge_tokens(batch_size=3, max_batches=2) == (6, 2)
+        assert len(remaining_tokens()) == 3
+        assert token_reaper.purge_tokens(batch_size=3, max_batches=2) == (1, 1)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert batch_sizes == [3, 3, 1]
+    assert remaining_tokens() == ["live-0", "live-1"]
+    assert token_reaper.purge_tokens(batch_size=3, max_batches=2) == (0, 0)
+
+
+def test_reaper_run_is_reported_in_metrics(client, auth_headers, seed, monkeypatch):
+    add_tokens(seed["user_id"], "revoked", 5, active=False, expires_in=timedelta(minutes=30))
+    monkeypatch.setattr(settings, "TOKEN_REAPER_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "TOKEN_REAPER_MAX_BATCHES", 10)
+    token_reaper.run_token_reaper()
+
+    metrics = client.get("/api/metrics/token-reaper", headers=auth_headers).json()
+    assert (metrics["removed"], metrics["batches"]) == (5, 3)
+    # el token de la sesión actual sigue en la tabla (sin pasar por la caché)
+    token_cache.clear()
+    assert client.get("/api/user", headers=auth_headers).status_code == 200